@@ -0,0 +1,249 @@
+# benchmark.py
+# ------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Timing harness for the multiagent project.
+
+The --search option compares the fixed depth search agents with the iterative
+deepening ones on positions along a random game, checking that they choose the
+same moves, and then plays each iterative deepening agent under a time budget,
+reporting the nodes searched and depth completed per move:
+
+> python benchmark.py --search
+> python benchmark.py --search --layouts smallClassic --depth 3 --timeLimit 0.5 --verbose
+
+The --alphabeta option counts the nodes full width minimax and AlphaBetaAgent,
+with each kind of move ordering, search at the same depth, checking that
+they agree on the value of every position:
+
+> python benchmark.py --alphabeta --depth 4 --positions 5 --evalFn betterEvaluationFunction
+
+The --successors option times GameState.generateSuccessor inside depth 3
+minimax on the minimax test layouts, with and without the GameState.explored
+bookkeeping the autograder uses:
+
+> python benchmark.py --successors
+"""
+
+import random
+import sys
+import time
+
+import layout
+import multiAgents
+import pacman
+from ghostAgents import RandomGhost
+
+
+def _gameState(layoutName, numGhosts=2):
+    lay = layout.getLayout(layoutName)
+    if lay == None: raise Exception("The layout " + layoutName + " cannot be found")
+    gameState = pacman.GameState()
+    gameState.initialize(lay, numGhosts)
+    return gameState
+
+
+def _play(gameState, pacmanAgent, numMoves, seed, onMove=None):
+    """
+    Plays up to numMoves rounds with pacmanAgent against random ghosts.
+    onMove(gameState, action) is called before each of Pacman's moves.
+    """
+    rng = random.Random(seed)
+    random.seed(seed)
+    ghosts = [RandomGhost(i) for i in range(1, gameState.getNumAgents())]
+    for _ in range(numMoves):
+        if gameState.isWin() or gameState.isLose(): break
+        action = pacmanAgent.getAction(gameState)
+        if onMove: onMove(gameState, action)
+        gameState = gameState.generateSuccessor(0, action)
+        for ghost in ghosts:
+            if gameState.isWin() or gameState.isLose(): break
+            gameState = gameState.generateSuccessor(ghost.index, rng.choice(gameState.getLegalActions(ghost.index)))
+    return gameState
+
+
+def _positions(layoutName, numPositions, seed):
+    "Pacman-to-move positions along a game played by a random Pacman."
+    positions = []
+    class Walker:
+        def getAction(self, gameState):
+            return random.choice(gameState.getLegalActions(0))
+    _play(_gameState(layoutName), Walker(), numPositions, seed,
+          lambda gameState, action: positions.append(gameState))
+    return positions
+
+
+SEARCH_AGENTS = [('Minimax', multiAgents.MinimaxAgent, multiAgents.IterativeMinimaxAgent),
+                 ('Expectimax', multiAgents.ExpectimaxAgent, multiAgents.IterativeExpectimaxAgent)]
+
+
+def runSearchBenchmark(layoutNames, depth, timeLimit, numPositions, numMoves, verbose, seed=0):
+    print('Fixed depth %d, %d positions per layout' % (depth, numPositions))
+    print('%-16s %-12s %12s %12s %10s %8s' % ('layout', 'search', 'fixed(s)', 'iterative(s)', 'speedup', 'agree'))
+    for layoutName in layoutNames:
+        positions = _positions(layoutName, numPositions, seed)
+        for name, fixedClass, iterativeClass in SEARCH_AGENTS:
+            fixed = fixedClass(depth=str(depth))
+            iterative = iterativeClass(depth=str(depth), timeLimit='1e9')
+            start = time.perf_counter()
+            fixedActions = [fixed.getAction(p) for p in positions]
+            fixedTime = time.perf_counter() - start
+            start = time.perf_counter()
+            iterativeActions = [iterative.getAction(p) for p in positions]
+            iterativeTime = time.perf_counter() - start
+            pacman.GameState.getAndResetExplored()
+            agree = sum(a == b for a, b in zip(fixedActions, iterativeActions))
+            print('%-16s %-12s %12.3f %12.3f %10.2f %5d/%d' % (layoutName, name, fixedTime, iterativeTime,
+                                                              fixedTime / iterativeTime, agree, len(positions)))
+
+    print('')
+    print('Time budget %.2fs per move, at most %d moves' % (timeLimit, numMoves))
+    print('%-16s %-12s %6s %12s %10s %10s %10s' % ('layout', 'search', 'moves', 'nodes/move', 'meanDepth', 'minDepth', 'maxDepth'))
+    for layoutName in layoutNames:
+        for name, fixedClass, iterativeClass in SEARCH_AGENTS:
+            agent = iterativeClass(depth='20', timeLimit=str(timeLimit))
+            _play(_gameState(layoutName), agent, numMoves, seed)
+            pacman.GameState.getAndResetExplored()
+            log = agent.searchLog
+            if verbose:
+                for move, (nodes, depthReached, seconds) in enumerate(log):
+                    print('  %s %s move %d: %d nodes, depth %d, %.3fs' % (layoutName, name, move, nodes, depthReached, seconds))
+            depths = [d for n, d, s in log]
+            print('%-16s %-12s %6d %12.0f %10.2f %10d %10d' % (layoutName, name, len(log), sum(n for n, d, s in log) / float(len(log)),
+                                                               sum(depths) / float(len(depths)), min(depths), max(depths)))
+
+
+def _minimaxValue(state, agentIndex, depth, evalFn, counter):
+    "Full width minimax as MinimaxAgent searches it, counting nodes in counter[0]."
+    counter[0] += 1
+    if state.isWin() or state.isLose() or depth == 0:
+        return evalFn(state)
+    nextAgent = (agentIndex + 1) % state.getNumAgents()
+    nextDepth = depth
+    if nextAgent == 0: nextDepth -= 1
+    values = [_minimaxValue(state.generateSuccessor(agentIndex, action), nextAgent, nextDepth, evalFn, counter)
+              for action in state.getLegalActions(agentIndex)]
+    if agentIndex == 0: return max(values)
+    return min(values)
+
+
+ORDERINGS = [('none', {}),
+             ('eval', {'evalOrder': 'True'}),
+             ('killers', {'killers': 'True'}),
+             ('history', {'history': 'True'}),
+             ('killers+history', {'killers': 'True', 'history': 'True'}),
+             ('all', {'evalOrder': 'True', 'killers': 'True', 'history': 'True'})]
+
+
+def runAlphaBetaBenchmark(layoutNames, depth, numPositions, evalFnName, seed=0):
+    evalFn = getattr(multiAgents, evalFnName)
+    print('Depth %d, %s, %d positions per layout' % (depth, evalFnName, numPositions))
+    print('%-16s %-16s %10s %10s %10s %10s %10s %8s' % ('layout', 'ordering', 'nodes', 'cutoffs', 'branching',
+                                                         'seconds', 'max move', 'values'))
+    for layoutName in layoutNames:
+        positions = _positions(layoutName, numPositions, seed)
+        plies = depth * positions[0].getNumAgents()
+
+        counter = [0]
+        start = time.perf_counter()
+        values = [_minimaxValue(p, 0, depth, evalFn, counter) for p in positions]
+        elapsed = time.perf_counter() - start
+        pacman.GameState.getAndResetExplored()
+        print('%-16s %-16s %10d %10s %10.2f %10.3f %10s %8s' % (layoutName, 'minimax', counter[0], '-',
+                                                               (counter[0] / float(len(positions))) ** (1.0 / plies),
+                                                               elapsed, '-', '-'))
+        for name, args in ORDERINGS:
+            agent = multiAgents.AlphaBetaAgent(evalFn=evalFnName, depth=str(depth), **args)
+            agree = 0
+            for p, value in zip(positions, values):
+                agent.getAction(p)
+                if agent.rootValue == value: agree += 1
+            pacman.GameState.getAndResetExplored()
+            nodes = sum(n for n, c, s in agent.searchLog)
+            print('%-16s %-16s %10d %10d %10.2f %10.3f %10.3f %5d/%d' % (layoutName, name, nodes,
+                                                                        sum(c for n, c, s in agent.searchLog),
+                                                                        (nodes / float(len(positions))) ** (1.0 / plies),
+                                                                        sum(s for n, c, s in agent.searchLog),
+                                                                        max(s for n, c, s in agent.searchLog),
+                                                                        agree, len(positions)))
+
+
+def runSuccessorBenchmark(layoutNames, depth, numPositions, seed=0):
+    evalFn = multiAgents.scoreEvaluationFunction
+    print('Depth %d minimax, %d positions per layout' % (depth, numPositions))
+    print('%-16s %-10s %12s %10s %14s' % ('layout', 'explored', 'successors', 'seconds', 'successors/sec'))
+    trackExplored = pacman.GameState.trackExplored
+    for layoutName in layoutNames:
+        positions = _positions(layoutName, numPositions, seed)
+        for track in [True, False]:
+            pacman.GameState.trackExplored = track
+            pacman.GameState.getAndResetExplored()
+            counter = [0]
+            start = time.perf_counter()
+            for p in positions:
+                _minimaxValue(p, 0, depth, evalFn, counter)
+            elapsed = time.perf_counter() - start
+            successors = counter[0] - len(positions)
+            print('%-16s %-10s %12d %10.3f %14.0f' % (layoutName, track and 'on' or 'off', successors, elapsed,
+                                                      successors / elapsed))
+    pacman.GameState.trackExplored = trackExplored
+    pacman.GameState.getAndResetExplored()
+
+
+def readCommand(argv):
+    from optparse import OptionParser
+    parser = OptionParser(__doc__)
+    parser.add_option('--search', action='store_true', dest='search', default=False,
+                      help='run the adversarial search benchmark')
+    parser.add_option('--alphabeta', action='store_true', dest='alphabeta', default=False,
+                      help='run the alpha-beta move ordering benchmark')
+    parser.add_option('--successors', action='store_true', dest='successors', default=False,
+                      help='run the successor generation benchmark')
+    parser.add_option('-l', '--layouts', dest='layouts', default=None,
+                      help='comma separated list of layouts (default smallClassic,mediumClassic, '
+                           'and minimaxClassic too for --successors)')
+    parser.add_option('-d', '--depth', dest='depth', type='int', default=3,
+                      help='depth of the fixed depth comparisons (default %default)')
+    parser.add_option('-e', '--evalFn', dest='evalFn', default='scoreEvaluationFunction',
+                      help='evaluation function for --alphabeta (default %default)')
+    parser.add_option('--timeLimit', dest='timeLimit', type='float', default=0.5,
+                      help='seconds per move for the time budget runs (default %default)')
+    parser.add_option('--positions', dest='positions', type='int', default=10,
+                      help='positions per layout for the fixed depth comparisons (default %default)')
+    parser.add_option('--moves', dest='moves', type='int', default=20,
+                      help='maximum moves per time budget run (default %default)')
+    parser.add_option('-v', '--verbose', action='store_true', dest='verbose', default=False,
+                      help='print every move of the time budget runs')
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        raise Exception('Command line input not understood: ' + str(otherjunk))
+    return options
+
+
+if __name__ == '__main__':
+    options = readCommand(sys.argv[1:])
+    layoutNames = ['smallClassic', 'mediumClassic']
+    if options.layouts: layoutNames = options.layouts.split(',')
+    if options.search:
+        runSearchBenchmark(layoutNames, options.depth, options.timeLimit, options.positions,
+                           options.moves, options.verbose)
+        sys.exit(0)
+    if options.alphabeta:
+        runAlphaBetaBenchmark(layoutNames, options.depth, options.positions, options.evalFn)
+        sys.exit(0)
+    if options.successors:
+        if not options.layouts: layoutNames = ['minimaxClassic'] + layoutNames
+        runSuccessorBenchmark(layoutNames, options.depth, options.positions)
+        sys.exit(0)
+    print(__doc__)
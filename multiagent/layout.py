@@ -14,6 +14,7 @@
 
 from util import manhattanDistance
 from game import Grid
+from game import toBitGrid
 import os
 import random
 from functools import reduce
@@ -26,7 +27,7 @@ class Layout:
     A Layout manages the static information about the game board.
     """
 
-    def __init__(self, layoutText):
+    def __init__(self, layoutText, bitGrids=False):
         self.width = len(layoutText[0])
         self.height = len(layoutText)
         self.walls = Grid(self.width, self.height, False)
@@ -36,6 +37,10 @@ class Layout:
         self.numGhosts = 0
         self.processLayoutText(layoutText)
         self.layoutText = layoutText
+        self.bitGrids = bitGrids
+        if bitGrids:
+            self.walls = toBitGrid(self.walls)
+            self.food = toBitGrid(self.food)
         self.totalFood = len(self.food.asList())
         # self.initializeVisibilityMatrix()
 
@@ -97,7 +102,7 @@ class Layout:
         return "\n".join(self.layoutText)
 
     def deepCopy(self):
-        return Layout(self.layoutText[:])
+        return Layout(self.layoutText[:], self.bitGrids)
 
     def processLayoutText(self, layoutText):
         """
@@ -137,28 +142,32 @@ class Layout:
             self.numGhosts += 1
 
 
-def getLayout(name, back=2):
+def getLayout(name, back=2, bitGrids=False):
+    """
+    Loads a layout by name.  With bitGrids, walls and food are stored as
+    game.BitGrid instead of game.Grid.
+    """
     if name.endswith('.lay'):
-        layout = tryToLoad('layouts/' + name)
+        layout = tryToLoad('layouts/' + name, bitGrids)
         if layout == None:
-            layout = tryToLoad(name)
+            layout = tryToLoad(name, bitGrids)
     else:
-        layout = tryToLoad('layouts/' + name + '.lay')
+        layout = tryToLoad('layouts/' + name + '.lay', bitGrids)
         if layout == None:
-            layout = tryToLoad(name + '.lay')
+            layout = tryToLoad(name + '.lay', bitGrids)
     if layout == None and back >= 0:
         curdir = os.path.abspath('.')
         os.chdir('..')
-        layout = getLayout(name, back - 1)
+        layout = getLayout(name, back - 1, bitGrids)
         os.chdir(curdir)
     return layout
 
 
-def tryToLoad(fullname):
+def tryToLoad(fullname, bitGrids=False):
     if(not os.path.exists(fullname)):
         return None
     f = open(fullname)
     try:
-        return Layout([line.strip() for line in f])
+        return Layout([line.strip() for line in f], bitGrids)
     finally:
         f.close()
@@ -14,7 +14,8 @@
 
 from util import manhattanDistance
 from game import Directions
-import random, util
+import random, time, util
+import mazeDistances
 
 from game import Agent
 
@@ -106,6 +107,10 @@ def scoreEvaluationFunction(currentGameState):
     """
     return currentGameState.getScore()
 
+# Evaluation functions of the form score + f(board) are marked scoreRelative,
+# which lets IterativeDeepeningAgent keep its transposition table by default
+scoreEvaluationFunction.scoreRelative = True
+
 
 class MultiAgentSearchAgent(Agent):
     """
@@ -203,14 +208,107 @@ class MinimaxAgent(MultiAgentSearchAgent):
 class AlphaBetaAgent(MultiAgentSearchAgent):
     """
     Your minimax agent with alpha-beta pruning (question 3)
+
+    Children are searched in legal move order unless move ordering is turned
+    on through the agent arguments:
+
+    evalOrder=True   best child by the evaluation function first
+    killers=True     moves that caused a cutoff at the same ply first
+    history=True     moves that caused many cutoffs from the same square first
+
+    Ordering changes which nodes are searched but not the minimax value.  For
+    every move, (nodes searched, cutoffs, seconds) is appended to
+    self.searchLog.
     """
 
+    def __init__(self, evalFn='scoreEvaluationFunction', depth='2',
+                 evalOrder='False', killers='False', history='False'):
+        MultiAgentSearchAgent.__init__(self, evalFn, depth)
+        self.evalOrder = str(evalOrder) == 'True'
+        self.killers = str(killers) == 'True'
+        self.history = str(history) == 'True'
+        self.searchLog = []
+
     def getAction(self, gameState):
         """
         Returns the minimax action using self.depth and self.evaluationFunction
         """
         "*** YOUR CODE HERE ***"
-        util.raiseNotDefined()
+        start = time.time()
+        self.nodes = 0
+        self.cutoffs = 0
+        self.killerMoves = {}
+        self.historyScores = util.Counter()
+        self.rootValue, action = self._value(gameState, 0, self.depth, 0, float('-inf'), float('inf'))
+        self.searchLog.append((self.nodes, self.cutoffs, time.time() - start))
+        return action
+
+    def _orderedChildren(self, state, agentIndex, ply):
+        """
+        The legal actions paired with their successors, in search order.  The
+        successor is None when it has not been generated yet.
+        """
+        children = [(action, None) for action in state.getLegalActions(agentIndex)]
+        if not (self.evalOrder or self.killers or self.history):
+            return children
+
+        if self.evalOrder:
+            children = [(action, state.generateSuccessor(agentIndex, action)) for action, _ in children]
+        sign = agentIndex == 0 and 1 or -1
+        killers = self.killerMoves.get(ply, [])
+        position = state.data.agentStates[agentIndex].getPosition()
+
+        def priority(child):
+            action, successor = child
+            return (self.killers and action in killers,
+                    self.history and self.historyScores[(agentIndex, position, action)],
+                    self.evalOrder and sign * self.evaluationFunction(successor))
+        # sorted is stable, so ties keep the legal move order
+        return sorted(children, key=priority, reverse=True)
+
+    def _cutoff(self, state, agentIndex, action, depth, ply):
+        self.cutoffs += 1
+        if self.killers:
+            killers = self.killerMoves.setdefault(ply, [])
+            if action not in killers:
+                killers.insert(0, action)
+                del killers[2:]
+        if self.history:
+            self.historyScores[(agentIndex, state.data.agentStates[agentIndex].getPosition(), action)] += depth * depth
+
+    def _value(self, state, agentIndex, depth, ply, alpha, beta):
+        """
+        Returns (value, best action) of state with agentIndex to move and
+        depth plies left.
+        """
+        self.nodes += 1
+        if state.isWin() or state.isLose() or depth == 0:
+            return self.evaluationFunction(state), None
+
+        nextAgent = (agentIndex + 1) % state.getNumAgents()
+        nextDepth = depth
+        if nextAgent == 0: nextDepth -= 1
+
+        maximize = agentIndex == 0
+        bestValue = maximize and float('-inf') or float('inf')
+        bestAction = None
+        for action, successor in self._orderedChildren(state, agentIndex, ply):
+            if successor is None:
+                successor = state.generateSuccessor(agentIndex, action)
+            value = self._value(successor, nextAgent, nextDepth, ply + 1, alpha, beta)[0]
+            if maximize:
+                if value > bestValue: bestValue, bestAction = value, action
+                if bestValue > beta:
+                    self._cutoff(state, agentIndex, action, depth, ply)
+                    break
+                alpha = max(alpha, bestValue)
+            else:
+                if value < bestValue: bestValue, bestAction = value, action
+                if bestValue < alpha:
+                    self._cutoff(state, agentIndex, action, depth, ply)
+                    break
+                beta = min(beta, bestValue)
+        return bestValue, bestAction
 
 
 class ExpectimaxAgent(MultiAgentSearchAgent):
@@ -269,7 +367,160 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
         return maximize(gameState, 0)
 
 
-def betterEvaluationFunction(currentGameState):
+class _SearchTimeout(Exception):
+    pass
+
+
+class IterativeDeepeningAgent(MultiAgentSearchAgent):
+    """
+    Searches to depth 1, 2, ... up to self.depth within a time budget of
+    timeLimit seconds per move, and plays the best move of the deepest search
+    that finished.
+
+    Values are kept in a transposition table so that a position reached by
+    two orders of moves is only searched once.  Positions are hashed
+    Zobrist-style: every (agent, position, direction, scared timer), food
+    dot and capsule gets a random 64 bit number and a position's key is the
+    xor of the numbers for what is on the board.  The food and capsule part
+    is updated incrementally from parent to child.  Values are stored
+    relative to the score of the position, which is only exact for
+    evaluation functions of the form score + f(board).  useTable turns the
+    lookups on or off; by default they are on if the evaluation function is
+    marked scoreRelative.  Without them the table is cleared every move and
+    only used to find the best move at the root.
+
+    Ghosts minimize, as in MinimaxAgent, unless combineGhostValues is
+    overridden.
+
+    For every move, (nodes searched, depth completed, seconds) is appended to
+    self.searchLog.
+    """
+
+    def __init__(self, evalFn='scoreEvaluationFunction', depth='6', timeLimit='1.0', tableSize='500000',
+                 useTable=None):
+        MultiAgentSearchAgent.__init__(self, evalFn, depth)
+        self.timeLimit = float(timeLimit)
+        self.tableSize = int(tableSize)
+        if useTable is None:
+            self.useTable = getattr(self.evaluationFunction, 'scoreRelative', False)
+        else:
+            self.useTable = str(useTable) == 'True'
+        self.table = {}
+        self.searchLog = []
+        self._zobrist = {}
+        self._random = random.Random(0)
+
+    def combineGhostValues(self, values):
+        "The value of a ghost's position given the values of its moves."
+        return min(values)
+
+    def getAction(self, gameState):
+        start = time.time()
+        self.deadline = start + self.timeLimit
+        self.nodes = 0
+        if not self.useTable or len(self.table) > self.tableSize: self.table.clear()
+
+        board = 0
+        for pos in gameState.getFood().asList(): board ^= self._z(('food', pos))
+        for pos in gameState.getCapsules(): board ^= self._z(('capsule', pos))
+
+        bestAction, depthReached = None, 0
+        for depth in range(1, self.depth + 1):
+            try:
+                self._value(gameState, board, 0, depth)
+            except _SearchTimeout:
+                break
+            if gameState.isWin() or gameState.isLose(): break
+            bestAction = self.table[(self._key(gameState, board), 0, depth)][1]
+            depthReached = depth
+
+        self.searchLog.append((self.nodes, depthReached, time.time() - start))
+        if bestAction is None:
+            actions = gameState.getLegalActions(0)
+            if not actions: return Directions.STOP
+            return actions[0]
+        return bestAction
+
+    def _z(self, feature):
+        value = self._zobrist.get(feature)
+        if value is None:
+            value = self._zobrist[feature] = self._random.getrandbits(64)
+        return value
+
+    def _key(self, state, board):
+        key = board
+        for index, agentState in enumerate(state.data.agentStates):
+            conf = agentState.configuration
+            # Pacman may always reverse, so only the ghosts' directions matter
+            direction = index and conf.direction
+            key ^= self._z((index, conf.pos, direction, agentState.scaredTimer))
+        return key
+
+    def _value(self, state, board, agentIndex, depth):
+        """
+        The value of state with agentIndex to move and depth plies left.
+        board is the food and capsule part of the state's key.
+        """
+        self.nodes += 1
+        if time.time() > self.deadline:
+            raise _SearchTimeout()
+        if state.isWin() or state.isLose() or depth == 0:
+            return self.evaluationFunction(state)
+
+        entryKey = (self._key(state, board), agentIndex, depth)
+        if self.useTable:
+            entry = self.table.get(entryKey)
+            if entry is not None:
+                return entry[0] + state.getScore()
+
+        nextAgent = (agentIndex + 1) % state.getNumAgents()
+        nextDepth = depth
+        if nextAgent == 0: nextDepth -= 1
+        actions = state.getLegalActions(agentIndex)
+        values = []
+        for action in actions:
+            successor = state.generateSuccessor(agentIndex, action)
+            successorBoard = board
+            if successor.data._foodEaten is not None:
+                successorBoard ^= self._z(('food', successor.data._foodEaten))
+            if successor.data._capsuleEaten is not None:
+                successorBoard ^= self._z(('capsule', successor.data._capsuleEaten))
+            values.append(self._value(successor, successorBoard, nextAgent, nextDepth))
+
+        if agentIndex == 0:
+            best = 0
+            for i in range(1, len(values)):
+                if values[i] > values[best]: best = i
+            value = values[best]
+        else:
+            value = self.combineGhostValues(values)
+            best = values.index(min(values))
+        self.table[entryKey] = (value - state.getScore(), actions[best])
+        return value
+
+
+class IterativeMinimaxAgent(IterativeDeepeningAgent):
+    """
+    Minimax with iterative deepening and a transposition table.  At a fixed
+    depth it chooses the same move as MinimaxAgent.
+    """
+
+
+class IterativeExpectimaxAgent(IterativeDeepeningAgent):
+    """
+    Expectimax with iterative deepening and a transposition table, ghosts
+    choosing uniformly at random from their legal moves.
+    """
+
+    def combineGhostValues(self, values):
+        prob = 1.0 / len(values)
+        expected = 0
+        for value in values:
+            expected += prob * value
+        return expected
+
+
+def betterEvaluationFunction(currentGameState, distance=util.manhattanDistance):
     """
     Your extreme ghost-hunting, pellet-nabbing, food-gobbling, unstoppable
     evaluation function (question 5).
@@ -293,7 +544,7 @@ def betterEvaluationFunction(currentGameState):
         if not li:
             return 0
         else:
-            return min([util.manhattanDistance(pac_pos, item) for item in li])
+            return min([distance(pac_pos, item) for item in li])
 
     closest_alive_ghost_dis = 5 if get_closest_distance(alive_ghost_positions) <= 0 else get_closest_distance(
         alive_ghost_positions)
@@ -305,5 +556,17 @@ def betterEvaluationFunction(currentGameState):
     return score
 
 
+def mazeEvaluationFunction(currentGameState):
+    """
+    betterEvaluationFunction measuring maze distances instead of Manhattan
+    distances, looked up in the mazeDistances table shared by every state of
+    the layout.  Chosen with -a evalFn=mazeEvaluationFunction.
+    """
+    distances = mazeDistances.getMazeDistances(currentGameState.getWalls())
+    return betterEvaluationFunction(currentGameState, distances.getDistance)
+
+betterEvaluationFunction.scoreRelative = True
+mazeEvaluationFunction.scoreRelative = True
+
 # Abbreviation
 better = betterEvaluationFunction
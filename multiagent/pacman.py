@@ -79,6 +79,9 @@ class GameState:
 
     # static variable keeps track of which states have had getLegalActions called
     explored = set()
+    # The autograder counts explored states; pacman.py turns this off, since
+    # hashing every state twice per successor is most of generateSuccessor's cost
+    trackExplored = True
 
     def getAndResetExplored():
         tmp = GameState.explored.copy()
@@ -129,8 +132,9 @@ class GameState:
         # Book keeping
         state.data._agentMoved = agentIndex
         state.data.score += state.data.scoreChange
-        GameState.explored.add(self)
-        GameState.explored.add(state)
+        if GameState.trackExplored:
+            GameState.explored.add(self)
+            GameState.explored.add(state)
         return state
 
     def getLegalPacmanActions(self):
@@ -230,7 +234,7 @@ class GameState:
         """
         Generates a new state by copying information from its predecessor.
         """
-        if prevState != None:  # Initial state
+        if prevState is not None:  # Initial state
             self.data = GameStateData(prevState.data)
         else:
             self.data = GameStateData()
@@ -554,6 +558,11 @@ def readCommand(argv):
                       help='Turns on exception handling and timeouts during games', default=False)
     parser.add_option('--timeout', dest='timeout', type='int',
                       help=default('Maximum length of time an agent can spend computing in a single game'), default=30)
+    parser.add_option('--bitGrids', action='store_true', dest='bitGrids',
+                      help='Store the food and walls as bitboards (game.BitGrid)', default=False)
+    parser.add_option('--workers', dest='workers', type='int',
+                      help=default('Play the games in this many processes, without graphics and with one '
+                                   'random seed per game (0 plays them in order as usual)'), default=0)
 
     options, otherjunk = parser.parse_args(argv)
     if len(otherjunk) != 0:
@@ -565,7 +574,7 @@ def readCommand(argv):
         random.seed('cs188')
 
     # Choose a layout
-    args['layout'] = layout.getLayout(options.layout)
+    args['layout'] = layout.getLayout(options.layout, bitGrids=options.bitGrids)
     if args['layout'] == None:
         raise Exception("The layout " + options.layout + " cannot be found")
 
@@ -591,7 +600,7 @@ def readCommand(argv):
     args['ghosts'] = [ghostType(i+1) for i in range(options.numGhosts)]
 
     # Choose a display format
-    if options.quietGraphics:
+    if options.quietGraphics or options.workers > 1:
         import textDisplay
         args['display'] = textDisplay.NullGraphics()
     elif options.textGraphics:
@@ -607,6 +616,16 @@ def readCommand(argv):
     args['catchExceptions'] = options.catchExceptions
     args['timeout'] = options.timeout
 
+    # Per-game seeds make a game's outcome independent of the process that plays it
+    if options.workers > 0:
+        if options.record or options.numTraining > 0:
+            raise Exception('--workers cannot be combined with recording or training games')
+        if options.fixRandomSeed:
+            args['gameSeeds'] = ['cs188-%d' % i for i in range(options.numGames)]
+        else:
+            args['gameSeeds'] = [random.getrandbits(32) for i in range(options.numGames)]
+        args['workers'] = options.workers
+
     # Special case: recorded games don't use the runGames method or args structure
     if options.gameToReplay != None:
         print('Replaying recorded game %s.' % options.gameToReplay)
@@ -672,14 +691,100 @@ def replayGame(layout, actions, display):
     display.finish()
 
 
-def runGames(layout, pacman, ghosts, display, numGames, record, numTraining=0, catchExceptions=False, timeout=30):
+class GameResult:
+    """
+    What a worker process sends back for one game: the final state and the
+    move history, which is all that runGames reports on.
+    """
+
+    def __init__(self, index, state, moveHistory, agentCrashed):
+        self.index = index
+        self.state = state
+        self.moveHistory = moveHistory
+        self.agentCrashed = agentCrashed
+
+
+_workerArgs = None
+
+
+def _initWorker(layout, pacman, ghosts, catchExceptions, timeout):
+    global _workerArgs
+    _workerArgs = (layout, pacman, ghosts, catchExceptions, timeout)
+
+
+def _playWorkerGame(job):
+    import textDisplay
+    index, seed = job
+    layout, pacman, ghosts, catchExceptions, timeout = _workerArgs
+    random.seed(seed)
+    rules = ClassicGameRules(timeout)
+    game = rules.newGame(layout, pacman, ghosts,
+                         textDisplay.NullGraphics(), True, catchExceptions)
+    game.run()
+    return GameResult(index, game.state, game.moveHistory, game.agentCrashed)
+
+
+def runGamesInParallel(layout, pacman, ghosts, numGames, gameSeeds, workers, catchExceptions=False, timeout=30):
+    """
+    Plays numGames independent games in a pool of worker processes, with
+    NullGraphics, seeding the random module with gameSeeds[i] before game i.
+    Results are printed as games finish and returned in game order.
+    """
+    import multiprocessing
+    pool = multiprocessing.Pool(workers, _initWorker,
+                                (layout, pacman, ghosts, catchExceptions, timeout))
+    games = [None] * numGames
+    try:
+        for result in pool.imap_unordered(_playWorkerGame, list(enumerate(gameSeeds))):
+            games[result.index] = result
+            if result.state.isWin():
+                print("Game %d: Pacman emerges victorious! Score: %d" %
+                      (result.index + 1, result.state.data.score))
+            else:
+                print("Game %d: Pacman died! Score: %d" %
+                      (result.index + 1, result.state.data.score))
+    finally:
+        pool.terminate()
+        pool.join()
+    return games
+
+
+def printSummary(games):
+    scores = [game.state.getScore() for game in games]
+    wins = [game.state.isWin() for game in games]
+    winRate = wins.count(True) / float(len(wins))
+    print('Average Score:', sum(scores) / float(len(scores)))
+    print('Scores:       ', ', '.join([str(score) for score in scores]))
+    print('Win Rate:      %d/%d (%.2f)' %
+          (wins.count(True), len(wins), winRate))
+    print('Record:       ', ', '.join(
+        [['Loss', 'Win'][int(w)] for w in wins]))
+
+
+def runGames(layout, pacman, ghosts, display, numGames, record, numTraining=0, catchExceptions=False, timeout=30,
+             gameSeeds=None, workers=0):
+    """
+    Plays numGames games and prints a summary of the ones that were not
+    training games.  If gameSeeds is given, the random module is reseeded with
+    gameSeeds[i] before game i, and with workers > 1 the games are played in
+    parallel by runGamesInParallel; either way game i turns out the same.
+    """
     import __main__
     __main__.__dict__['_display'] = display
 
+    if workers > 1:
+        games = runGamesInParallel(layout, pacman, ghosts, numGames, gameSeeds, workers,
+                                   catchExceptions, timeout)
+        if numGames > 0:
+            printSummary(games)
+        return games
+
     rules = ClassicGameRules(timeout)
     games = []
 
     for i in range(numGames):
+        if gameSeeds is not None:
+            random.seed(gameSeeds[i])
         beQuiet = i < numTraining
         if beQuiet:
                 # Suppress output and graphics
@@ -706,15 +811,7 @@ def runGames(layout, pacman, ghosts, display, numGames, record, numTraining=0, c
             f.close()
 
     if (numGames-numTraining) > 0:
-        scores = [game.state.getScore() for game in games]
-        wins = [game.state.isWin() for game in games]
-        winRate = wins.count(True) / float(len(wins))
-        print('Average Score:', sum(scores) / float(len(scores)))
-        print('Scores:       ', ', '.join([str(score) for score in scores]))
-        print('Win Rate:      %d/%d (%.2f)' %
-              (wins.count(True), len(wins), winRate))
-        print('Record:       ', ', '.join(
-            [['Loss', 'Win'][int(w)] for w in wins]))
+        printSummary(games)
 
     return games
 
@@ -730,6 +827,7 @@ if __name__ == '__main__':
 
     > python pacman.py --help
     """
+    GameState.trackExplored = False
     args = readCommand(sys.argv[1:])  # Get game components based on input
     runGames(**args)
 
@@ -0,0 +1,612 @@
+# benchmark.py
+# ------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Timing harness for the reinforcement project.
+
+The --valueIteration option times ValueIterationAgent against
+CompiledValueIterationAgent on generated square gridworlds, checking that
+they compute the same values.  ValueIterationAgent is only run on the sizes
+up to --maxBaseline:
+
+> python benchmark.py --valueIteration
+> python benchmark.py --valueIteration --sizes 10,50,100 --iterations 100 --maxBaseline 100
+
+The --sweeping option measures Bellman backups per second and the time to
+get every value within --epsilon of the converged values, for value
+iteration and for prioritized sweeping, on MazeGrid and generated grids:
+
+> python benchmark.py --sweeping --sizes 20,50,100,200 --epsilon 1e-4
+
+The --training option compares Q-learning episodes per second through
+gridworld.runEpisode, as gridworld.py -q runs them, with
+gridworld.runEpisodesHeadless:
+
+> python benchmark.py --training --episodes 5000
+
+The --qtables option compares Q-learning updates per second with the
+util.Counter and the qTables.DenseQTable backends, on gridworlds and on the
+crawler (drawn on a canvas that ignores drawing), checking that both learn
+the same Q-values:
+
+> python benchmark.py --qtables --episodes 5000 --steps 200000
+
+The --approximate option times training games of ApproximateQAgent with
+SimpleExtractor against random ghosts, with the sparse feature pipeline and
+with the util.Counter weights and uncached features it replaced, counting
+feature extractions and checking that both learn the same weights:
+
+> python benchmark.py --approximate --games 1000 --layouts mediumGrid,smallClassic
+
+The --features option measures the latency of SimpleExtractor per step (the
+features of every legal action of a state) along random games, with the
+incremental food distance field and with the breadth first search from each
+next position it replaced, checking that the features agree:
+
+> python benchmark.py --features --states 5000 --layouts mediumClassic,originalClassic
+
+The --replay option trains ApproximateQAgent with SimpleExtractor from
+each transition as it happens and from minibatches of a replay buffer,
+timing how long each takes to win --target of the last --window training
+games:
+
+> python benchmark.py --replay --target 0.9 --window 10 --layouts smallGrid,mediumGrid
+
+The --checkpoints option times saving and loading gridworld Q-tables of each
+of the --sizes numbers of states with four actions each, and weights over
+that many features, in the format of checkpoints.py, against pickling the
+same util.Counter:
+
+> python benchmark.py --checkpoints --sizes 10000,100000,250000
+"""
+
+import contextlib
+import gc
+import io
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+
+import checkpoints
+import crawler
+import featureExtractors
+import ghostAgents
+import gridworld
+import layout
+import pacman
+import qlearningAgents
+import textDisplay
+import util
+import valueIterationAgents
+
+
+def makeGeneratedGridworld(size, seed=0):
+    """
+    A size x size gridworld with about one wall in ten, a +1 exit in the top
+    right corner, a few -1 exits and the start in the bottom left corner.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for y in range(size):
+        row = []
+        for x in range(size):
+            r = rng.random()
+            if r < 0.1: row.append('#')
+            elif r < 0.11: row.append(-1)
+            else: row.append(' ')
+        rows.append(row)
+    rows[0][size - 1] = 1
+    rows[size - 1][0] = 'S'
+    return gridworld.Gridworld(rows)
+
+
+def runValueIterationBenchmark(sizes, iterations, maxBaseline, discount=0.9):
+    print('%d iterations, discount %s' % (iterations, discount))
+    print('%8s %10s %14s %12s %14s %12s %10s %8s' % ('size', 'states', 'baseline(s)', 'compile(s)', 'iterations(s)',
+                                                     'per iter(ms)', 'speedup', 'same'))
+    for size in sizes:
+        mdp = makeGeneratedGridworld(size)
+
+        start = time.perf_counter()
+        compiled = valueIterationAgents.CompiledValueIterationAgent(mdp, discount, 0)
+        compileTime = time.perf_counter() - start
+        start = time.perf_counter()
+        compiled = valueIterationAgents.CompiledValueIterationAgent(mdp, discount, iterations)
+        iterationTime = time.perf_counter() - start - compileTime
+
+        baseline, speedup, same = '-', '-', '-'
+        if size <= maxBaseline:
+            start = time.perf_counter()
+            agent = valueIterationAgents.ValueIterationAgent(mdp, discount, iterations)
+            elapsed = time.perf_counter() - start
+            baseline = '%.3f' % elapsed
+            speedup = '%.1f' % (elapsed / (compileTime + iterationTime))
+            same = str(all(agent.getValue(s) == compiled.getValue(s) for s in mdp.getStates()))
+        print('%8s %10d %14s %12.3f %14.3f %12.3f %10s %8s' % ('%dx%d' % (size, size), compiled.compiled.numStates,
+                                                              baseline, compileTime, iterationTime,
+                                                              iterationTime / iterations * 1000, speedup, same))
+
+
+def _maxError(agent, mdp, reference):
+    return max(abs(agent.getValue(s) - reference.getValue(s)) for s in mdp.getStates())
+
+
+def runSweepingBenchmark(sizes, epsilon, maxBaseline, discount=0.9):
+    """
+    Value iteration is run for the fewest iterations that bring every value
+    within epsilon; CompiledPrioritizedSweepingAgent sweeps until converged
+    with theta = epsilon * (1 - discount), which bounds its error by epsilon.
+    PrioritizedSweepingValueIterationAgent is given as many updates as the
+    compiled sweeping needed.
+    """
+    print('epsilon %s, discount %s' % (epsilon, discount))
+    print('%-10s %8s %-28s %10s %10s %14s %12s' % ('grid', 'states', 'agent', 'backups', 'seconds', 'backups/sec', 'maxError'))
+    grids = [('MazeGrid', 0, gridworld.getMazeGrid())] + [('%dx%d' % (n, n), n, makeGeneratedGridworld(n)) for n in sizes]
+    for name, size, mdp in grids:
+        reference = valueIterationAgents.CompiledValueIterationAgent(mdp, discount, 100000, 1e-13)
+        compiled = reference.compiled
+        numUpdated = len(compiled.stateSlices)
+
+        values, iterations = [0] * compiled.numStates, 0
+        while max(abs(v - r) for v, r in zip(values, reference.stateValues)) >= epsilon:
+            values = compiled.bellmanBackup(values, discount)
+            iterations += 1
+
+        runs = []
+        if size <= maxBaseline:
+            runs.append(('ValueIterationAgent', iterations * numUpdated,
+                         lambda: valueIterationAgents.ValueIterationAgent(mdp, discount, iterations)))
+        runs.append(('CompiledValueIterationAgent', iterations * numUpdated,
+                     lambda: valueIterationAgents.CompiledValueIterationAgent(mdp, discount, iterations)))
+        sweeps = valueIterationAgents.CompiledPrioritizedSweepingAgent(mdp, discount, 0, epsilon * (1 - discount), True).iterationsRun
+        if size <= maxBaseline:
+            runs.append(('PrioritizedSweeping...Agent', sweeps,
+                         lambda: valueIterationAgents.PrioritizedSweepingValueIterationAgent(mdp, discount, sweeps, epsilon * (1 - discount))))
+        runs.append(('CompiledPrioritizedSweeping', sweeps,
+                     lambda: valueIterationAgents.CompiledPrioritizedSweepingAgent(mdp, discount, 0, epsilon * (1 - discount), True)))
+
+        for agentName, backups, makeAgent in runs:
+            start = time.perf_counter()
+            agent = makeAgent()
+            elapsed = time.perf_counter() - start
+            print('%-10s %8d %-28s %10d %10.3f %14.0f %12.2e' % (name, compiled.numStates, agentName, backups, elapsed,
+                                                                backups / elapsed, _maxError(agent, mdp, reference)))
+
+
+def runTrainingBenchmark(gridNames, numEpisodes, discount=0.9, seed=0):
+    print('%d episodes of Q-learning, alpha 0.5, epsilon 0.3' % numEpisodes)
+    print('%-12s %-20s %10s %10s %14s' % ('grid', 'loop', 'steps', 'seconds', 'episodes/sec'))
+    for gridName in gridNames:
+        for loopName in ['runEpisode', 'runEpisodesHeadless']:
+            mdp = getattr(gridworld, 'get' + gridName)()
+            environment = gridworld.GridworldEnvironment(mdp)
+            agent = qlearningAgents.QLearningAgent(actionFn=mdp.getPossibleActions, gamma=discount, alpha=0.5,
+                                                   epsilon=0.3, numTraining=numEpisodes)
+            steps = [0]
+            def update(state, action, nextState, reward, update=agent.update):
+                steps[0] += 1
+                update(state, action, nextState, reward)
+            agent.update = update
+            random.seed(seed)
+            start = time.perf_counter()
+            if loopName == 'runEpisode':
+                for episode in range(1, numEpisodes + 1):
+                    gridworld.runEpisode(agent, environment, discount, agent.getAction, lambda state: None,
+                                         lambda message: None, lambda: None, episode)
+            else:
+                gridworld.runEpisodesHeadless(agent, environment, discount, numEpisodes, random.Random(seed))
+            elapsed = time.perf_counter() - start
+            print('%-12s %-20s %10d %10.3f %14.0f' % (gridName, loopName, steps[0], elapsed, numEpisodes / elapsed))
+
+
+class _NullCanvas:
+    "Just enough of a tkinter canvas for crawler.CrawlingRobot, drawing nothing."
+    def winfo_reqwidth(self): return 1000
+    def winfo_reqheight(self): return 200
+    def create_rectangle(self, *args, **kwargs): return 0
+    def create_polygon(self, *args, **kwargs): return 0
+    def create_line(self, *args, **kwargs): return 0
+    def create_text(self, *args, **kwargs): return 0
+    def coords(self, *args): pass
+    def delete(self, *args): pass
+
+
+def _recordUpdates(agent):
+    "Makes agent keep every (state, action, nextState, reward) it learns from in the returned list."
+    transitions = []
+    def update(state, action, nextState, reward, update=agent.update):
+        transitions.append((state, action, nextState, reward))
+        update(state, action, nextState, reward)
+    agent.update = update
+    return transitions
+
+
+def _gridworldRun(makeMdp, qTable, numEpisodes, discount, seed):
+    mdp = makeMdp()
+    environment = gridworld.GridworldEnvironment(mdp)
+    agent = qlearningAgents.QLearningAgent(qTable=qTable, actionFn=mdp.getPossibleActions, gamma=discount,
+                                           alpha=0.5, epsilon=0.3, numTraining=numEpisodes)
+    transitions = _recordUpdates(agent)
+    random.seed(seed)
+    gridworld.runEpisodesHeadless(agent, environment, discount, numEpisodes, random.Random(seed))
+    return agent, transitions
+
+
+def _crawlerRun(qTable, numSteps, discount, seed):
+    environment = crawler.CrawlingRobotEnvironment(crawler.CrawlingRobot(_NullCanvas()))
+    agent = qlearningAgents.QLearningAgent(qTable=qTable, actionFn=environment.getPossibleActions,
+                                           gamma=discount, alpha=0.8, epsilon=0.5)
+    transitions = _recordUpdates(agent)
+    agent.startEpisode()
+    random.seed(seed)
+    for _ in range(numSteps):
+        state = environment.getCurrentState()
+        action = agent.getAction(state)
+        nextState, reward = environment.doAction(action)
+        agent.observeTransition(state, action, nextState, reward)
+    return agent, transitions
+
+
+def runQTableBenchmark(numEpisodes, numSteps, discount=0.9, seed=0):
+    """
+    For each problem and backend, times a whole learning run (acting and
+    updating, steps/sec) and then replays the run's transitions through a
+    fresh agent's update alone (updates/sec).
+    """
+    print('%-16s %-8s %10s %16s %14s %8s' % ('problem', 'qTable', 'updates', 'learning steps/s', 'updates/sec', 'same'))
+    problems = [(name, lambda qTable, name=name: _gridworldRun(getattr(gridworld, 'get' + name), qTable,
+                                                             numEpisodes, discount, seed))
+                for name in ['BookGrid', 'MazeGrid']]
+    problems.append(('generated 20x20', lambda qTable: _gridworldRun(lambda: makeGeneratedGridworld(20), qTable,
+                                                                     numEpisodes, discount, seed)))
+    problems.append(('crawler', lambda qTable: _crawlerRun(qTable, numSteps, discount, seed)))
+    for name, run in problems:
+        qValues = {}
+        for qTable in ['counter', 'dense']:
+            start = time.perf_counter()
+            agent, transitions = run(qTable)
+            learning = time.perf_counter() - start
+            qValues[qTable] = sorted(agent.values.items(), key=str)
+
+            replay = qlearningAgents.QLearningAgent(qTable=qTable, actionFn=agent.actionFn, gamma=discount,
+                                                    alpha=agent.alpha, epsilon=0.0)
+            start = time.perf_counter()
+            for state, action, nextState, reward in transitions:
+                replay.update(state, action, nextState, reward)
+            updating = time.perf_counter() - start
+            same = qTable == 'dense' and str([v for k, v in qValues['counter'] if v] ==
+                                             [v for k, v in qValues['dense'] if v]) or '-'
+            print('%-16s %-8s %10d %16.0f %14.0f %8s' % (name, qTable, len(transitions), len(transitions) / learning,
+                                                        len(transitions) / updating, same))
+
+
+class _CounterApproximateQAgent(qlearningAgents.ApproximateQAgent):
+    "ApproximateQAgent as it was before the sparse feature pipeline, as a baseline."
+    def __init__(self, **args):
+        qlearningAgents.ApproximateQAgent.__init__(self, **args)
+        self.weights = util.Counter()
+
+    def getWeights(self):
+        return self.weights
+
+    def getQValue(self, state, action):
+        return self.weights * self.featExtractor.getFeatures(state, action)
+
+    def update(self, state, action, nextState, reward):
+        diff = (reward + self.discount * self.computeValueFromQValues(nextState)) - self.getQValue(state, action)
+        features = self.featExtractor.getFeatures(state, action)
+        for f in features:
+            self.weights[f] = self.weights[f] + self.alpha * diff * features[f]
+
+
+def _countExtractions(agent):
+    "Makes agent count its calls to featExtractor.getFeatures in the returned list."
+    counter = [0]
+    def getFeatures(state, action, getFeatures=agent.featExtractor.getFeatures):
+        counter[0] += 1
+        return getFeatures(state, action)
+    agent.featExtractor.getFeatures = getFeatures
+    return counter
+
+
+def _trainPacman(agent, layoutName, numGames, seed):
+    "Plays numGames training games against random ghosts and returns the number of Pacman moves."
+    lay = layout.getLayout(layoutName)
+    ghosts = [ghostAgents.RandomGhost(i + 1) for i in range(lay.getNumGhosts())]
+    random.seed(seed)
+    rules = pacman.ClassicGameRules()
+    moves = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(numGames):
+            game = rules.newGame(lay, agent, ghosts, textDisplay.NullGraphics(), True)
+            game.run()
+            moves += sum(1 for agentIndex, action in game.moveHistory if agentIndex == 0)
+    return moves
+
+
+def runApproximateBenchmark(layoutNames, numGames, seed=0):
+    print('%d training games per layout' % numGames)
+    print('%-14s %-10s %10s %12s %10s %10s %12s %8s' % ('layout', 'pipeline', 'steps', 'extractions', 'seconds',
+                                                         'games/sec', 'steps/sec', 'same'))
+    for layoutName in layoutNames:
+        weights = {}
+        for name, agentClass in [('counter', _CounterApproximateQAgent),
+                                 ('sparse', qlearningAgents.ApproximateQAgent)]:
+            agent = agentClass(extractor='SimpleExtractor', numTraining=numGames)
+            extractions = _countExtractions(agent)
+            start = time.perf_counter()
+            moves = _trainPacman(agent, layoutName, numGames, seed)
+            elapsed = time.perf_counter() - start
+            weights[name] = agent.getWeights()
+            same = '-'
+            if name == 'sparse':
+                same = str(sorted(weights['counter']) == sorted(weights['sparse']) and
+                           all(abs(weights['counter'][f] - weights['sparse'][f]) < 1e-9 for f in weights['sparse']))
+            print('%-14s %-10s %10d %12d %10.2f %10.1f %12.0f %8s' % (layoutName, name, moves, extractions[0], elapsed,
+                                                                     numGames / elapsed, moves / elapsed, same))
+
+
+class _BreadthFirstSimpleExtractor(featureExtractors.FeatureExtractor):
+    "SimpleExtractor as it was before the food distance field, as a baseline."
+    def getFeatures(self, state, action):
+        food = state.getFood()
+        walls = state.getWalls()
+        ghosts = state.getGhostPositions()
+        features = util.Counter()
+        features["bias"] = 1.0
+        x, y = state.getPacmanPosition()
+        dx, dy = featureExtractors.Actions.directionToVector(action)
+        next_x, next_y = int(x + dx), int(y + dy)
+        features["#-of-ghosts-1-step-away"] = sum((next_x, next_y) in featureExtractors.Actions.getLegalNeighbors(g, walls)
+                                                  for g in ghosts)
+        if not features["#-of-ghosts-1-step-away"] and food[next_x][next_y]:
+            features["eats-food"] = 1.0
+        dist = featureExtractors.closestFood((next_x, next_y), food, walls)
+        if dist is not None:
+            features["closest-food"] = float(dist) / (walls.width * walls.height)
+        features.divideAll(10.0)
+        return features
+
+
+def _pacmanStates(layoutName, numStates, seed):
+    """
+    Pacman-to-move states along games played by a random Pacman against
+    random ghosts, copied as the game copies the agent's observations.
+    """
+    lay = layout.getLayout(layoutName)
+    rng = random.Random(seed)
+    states = []
+    while len(states) < numStates:
+        state = pacman.GameState()
+        state.initialize(lay, lay.getNumGhosts())
+        while len(states) < numStates and not (state.isWin() or state.isLose()):
+            states.append(state.deepCopy())
+            for agentIndex in range(state.getNumAgents()):
+                if state.isWin() or state.isLose(): break
+                state = state.generateSuccessor(agentIndex, rng.choice(state.getLegalActions(agentIndex)))
+    pacman.GameState.getAndResetExplored()
+    return states
+
+
+def runFeatureBenchmark(layoutNames, numStates, seed=0):
+    print('%d steps per layout, latency per step in microseconds' % numStates)
+    print('%-16s %-14s %10s %10s %10s %10s %8s' % ('layout', 'closest food', 'mean', 'median', '95th', 'max', 'same'))
+    for layoutName in layoutNames:
+        states = _pacmanStates(layoutName, numStates, seed)
+        legalActions = [state.getLegalActions(0) for state in states]
+        features = {}
+        for name, extractor in [('search', _BreadthFirstSimpleExtractor()),
+                                ('field', featureExtractors.SimpleExtractor())]:
+            latencies = []
+            features[name] = []
+            # Collections of the kept features would show up as latency spikes
+            gc.collect()
+            gc.disable()
+            for state, actions in zip(states, legalActions):
+                start = time.perf_counter()
+                stepFeatures = [extractor.getFeatures(state, action) for action in actions]
+                latencies.append(1e6 * (time.perf_counter() - start))
+                features[name].append(stepFeatures)
+            gc.enable()
+            latencies.sort()
+            same = name == 'field' and str(features['search'] == features['field']) or '-'
+            print('%-16s %-14s %10.1f %10.1f %10.1f %10.1f %8s' % (layoutName, name, sum(latencies) / len(latencies),
+                                                                  latencies[len(latencies) // 2],
+                                                                  latencies[int(0.95 * len(latencies))],
+                                                                  latencies[-1], same))
+
+
+REPLAY_CONFIGURATIONS = [('online', {}),
+                         ('replay b8', {'replay': '10000', 'batchSize': '8'}),
+                         ('replay b32', {'replay': '10000', 'batchSize': '32'}),
+                         ('replay b32/4', {'replay': '10000', 'batchSize': '32', 'replayEvery': '4'})]
+
+
+def _trainToWinRate(agent, layoutName, target, window, maxGames, seed):
+    """
+    Plays training games against random ghosts until target of the last
+    window games are won, or maxGames are played.  Returns the games
+    played, Pacman moves made and seconds taken, and whether target was met.
+    """
+    lay = layout.getLayout(layoutName)
+    ghosts = [ghostAgents.RandomGhost(i + 1) for i in range(lay.getNumGhosts())]
+    rules = pacman.ClassicGameRules()
+    random.seed(seed)
+    wins = []
+    moves = 0
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        while len(wins) < maxGames:
+            game = rules.newGame(lay, agent, ghosts, textDisplay.NullGraphics(), True)
+            game.run()
+            moves += sum(1 for agentIndex, action in game.moveHistory if agentIndex == 0)
+            wins.append(game.state.isWin())
+            if len(wins) >= window and sum(wins[-window:]) >= target * window:
+                break
+    reached = len(wins) >= window and sum(wins[-window:]) >= target * window
+    return len(wins), moves, time.perf_counter() - start, reached
+
+
+def runReplayBenchmark(layoutNames, target, window, maxGames, numSeeds):
+    print('Time to win %d%% of the last %d training games, mean over %d seeds' % (100 * target, window, numSeeds))
+    print('%-12s %-14s %10s %10s %10s %12s %8s' % ('layout', 'updates', 'games', 'steps', 'seconds', 'steps/sec',
+                                                   'reached'))
+    for layoutName in layoutNames:
+        for name, args in REPLAY_CONFIGURATIONS:
+            runs = []
+            for seed in range(numSeeds):
+                agent = qlearningAgents.ApproximateQAgent(extractor='SimpleExtractor', numTraining=maxGames, **args)
+                runs.append(_trainToWinRate(agent, layoutName, target, window, maxGames, seed))
+            games, moves, seconds = [sum(run[i] for run in runs) / float(numSeeds) for i in range(3)]
+            print('%-12s %-14s %10.1f %10.0f %10.2f %12.0f %5d/%d' % (layoutName, name, games, moves, seconds,
+                                                                      moves / seconds, sum(run[3] for run in runs),
+                                                                      numSeeds))
+
+
+def _timed(function):
+    "(result of function(), milliseconds it took)"
+    start = time.perf_counter()
+    result = function()
+    return result, 1000 * (time.perf_counter() - start)
+
+
+def runCheckpointBenchmark(sizes, seed=0):
+    rng = random.Random(seed)
+    actions = ['north', 'west', 'south', 'east']
+    actionFn = lambda state: actions
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'benchmark.qck')
+    print('%-10s %-10s %10s %10s %10s %10s %8s' % ('states', 'table', 'MB', 'save(ms)', 'load(ms)', 'mapped(ms)',
+                                                   'same'))
+    for size in sizes:
+        width = int(size ** 0.5)
+        states = [(i % width, i // width) for i in range(size)]
+        for name in ['pickle', 'counter', 'dense', 'weights']:
+            if name == 'weights':
+                agent = qlearningAgents.ApproximateQAgent(extractor='IdentityExtractor', actionFn=actionFn)
+                agent.setWeights(dict(((state, action), rng.random()) for state in states for action in actions))
+                saved = agent.getWeights()
+            else:
+                agent = qlearningAgents.QLearningAgent(qTable=name == 'dense' and 'dense' or 'counter',
+                                                       actionFn=actionFn)
+                for state in states:
+                    for action in actions:
+                        agent.values[(state, action)] = rng.random()
+                saved = dict(agent.values.items())
+            if name == 'pickle':
+                with open(path, 'wb') as f:
+                    save = _timed(lambda: pickle.dump(agent.values, f, pickle.HIGHEST_PROTOCOL))[1]
+                with open(path, 'rb') as f:
+                    values, load = _timed(lambda: pickle.load(f))
+                mapped = '-'
+            else:
+                save = _timed(lambda: agent.saveCheckpoint(path))[1]
+                fresh = agent.__class__(actionFn=actionFn, **(name == 'dense' and {'qTable': 'dense'} or {}))
+                load = _timed(lambda: fresh.loadCheckpoint(path))[1]
+                values = name == 'weights' and fresh.getWeights() or fresh.values
+                mapped = '%10.1f' % _timed(lambda: checkpoints.readCheckpoint(path, mapped=True))[1]
+            same = dict(values.items()) == saved
+            print('%-10d %-10s %10.2f %10.1f %10.1f %10s %8s' % (size, name, os.path.getsize(path) / 1e6, save, load,
+                                                                mapped, same))
+    os.remove(path)
+    os.rmdir(directory)
+
+
+def readCommand(argv):
+    from optparse import OptionParser
+    parser = OptionParser(__doc__)
+    parser.add_option('--valueIteration', action='store_true', dest='valueIteration', default=False,
+                      help='run the value iteration scaling benchmark')
+    parser.add_option('--sweeping', action='store_true', dest='sweeping', default=False,
+                      help='run the prioritized sweeping benchmark')
+    parser.add_option('--training', action='store_true', dest='training', default=False,
+                      help='run the Q-learning episode loop benchmark')
+    parser.add_option('--qtables', action='store_true', dest='qtables', default=False,
+                      help='run the Q-table backend benchmark')
+    parser.add_option('--approximate', action='store_true', dest='approximate', default=False,
+                      help='run the approximate Q-learning feature pipeline benchmark')
+    parser.add_option('--games', dest='games', type='int', default=500,
+                      help='training games per layout for --approximate, and the most per run for --replay '
+                           '(default %default)')
+    parser.add_option('--features', action='store_true', dest='features', default=False,
+                      help='run the feature extraction latency benchmark')
+    parser.add_option('--states', dest='states', type='int', default=5000,
+                      help='steps per layout for --features (default %default)')
+    parser.add_option('--checkpoints', action='store_true', dest='checkpoints', default=False,
+                      help='run the checkpoint save and load benchmark')
+    parser.add_option('--replay', action='store_true', dest='replay', default=False,
+                      help='run the experience replay benchmark')
+    parser.add_option('--target', dest='target', type='float', default=0.9,
+                      help='win rate to train to for --replay (default %default)')
+    parser.add_option('--window', dest='window', type='int', default=10,
+                      help='games the --replay win rate is measured over (default %default)')
+    parser.add_option('--seeds', dest='seeds', type='int', default=5,
+                      help='seeds per configuration for --replay (default %default)')
+    parser.add_option('-l', '--layouts', dest='layouts', default=None,
+                      help='comma separated layouts (default mediumGrid,smallClassic for --approximate, '
+                           'mediumClassic,originalClassic for --features, smallGrid,mediumGrid for --replay)')
+    parser.add_option('--episodes', dest='episodes', type='int', default=5000,
+                      help='episodes per run for --training and --qtables (default %default)')
+    parser.add_option('--steps', dest='steps', type='int', default=200000,
+                      help='crawler steps for --qtables (default %default)')
+    parser.add_option('--sizes', dest='sizes', default=None,
+                      help='comma separated gridworld sizes (default 10,20,50,100,200,500, '
+                           'or 20,50,100,200 for --sweeping), or numbers of states for --checkpoints '
+                           '(default 10000,100000,250000)')
+    parser.add_option('--epsilon', dest='epsilon', type='float', default=1e-4,
+                      help='target error for --sweeping (default %default)')
+    parser.add_option('-i', '--iterations', dest='iterations', type='int', default=100,
+                      help='iterations of value iteration (default %default)')
+    parser.add_option('--maxBaseline', dest='maxBaseline', type='int', default=50,
+                      help='largest size to run ValueIterationAgent on (default %default)')
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        raise Exception('Command line input not understood: ' + str(otherjunk))
+    return options
+
+
+if __name__ == '__main__':
+    options = readCommand(sys.argv[1:])
+    if options.valueIteration:
+        sizes = options.sizes or '10,20,50,100,200,500'
+        runValueIterationBenchmark([int(s) for s in sizes.split(',')], options.iterations, options.maxBaseline)
+        sys.exit(0)
+    if options.sweeping:
+        sizes = options.sizes or '20,50,100,200'
+        runSweepingBenchmark([int(s) for s in sizes.split(',')], options.epsilon, options.maxBaseline)
+        sys.exit(0)
+    if options.training:
+        runTrainingBenchmark(['BookGrid', 'MazeGrid', 'CliffGrid'], options.episodes)
+        sys.exit(0)
+    if options.qtables:
+        runQTableBenchmark(options.episodes, options.steps)
+        sys.exit(0)
+    if options.approximate:
+        runApproximateBenchmark((options.layouts or 'mediumGrid,smallClassic').split(','), options.games)
+        sys.exit(0)
+    if options.features:
+        runFeatureBenchmark((options.layouts or 'mediumClassic,originalClassic').split(','), options.states)
+        sys.exit(0)
+    if options.replay:
+        runReplayBenchmark((options.layouts or 'smallGrid,mediumGrid').split(','), options.target, options.window,
+                           options.games, options.seeds)
+        sys.exit(0)
+    if options.checkpoints:
+        sizes = options.sizes or '10000,100000,250000'
+        runCheckpointBenchmark([int(s) for s in sizes.split(',')])
+        sys.exit(0)
+    print(__doc__)
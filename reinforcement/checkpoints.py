@@ -0,0 +1,101 @@
+# checkpoints.py
+# --------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Checkpoints of what a Q-learning agent has learned: its Q-values, or the
+weights of an ApproximateQAgent.  QLearningAgent loads one at startup and
+saves one every checkpointEvery training episodes, and at the end of
+training, when given the agent args
+
+python pacman.py -p PacmanQAgent -x 2000 -n 2010 -l smallGrid -a checkpoint=small.qck,checkpointEvery=500
+
+and a later run given just checkpoint=small.qck starts from the saved values:
+
+python pacman.py -p PacmanQAgent -n 10 -l smallGrid -a checkpoint=small.qck
+
+A checkpoint file is a header, an index and an array of doubles:
+
+  magic 'QCKP', version, byte order, index offset and length,
+  values offset and count (struct HEADER)
+  index   pickled dict saying what each value is: the (state, action) key
+          of each Q-value, the states, actions and legal actions of a
+          DenseQTable, or the feature names of the weights
+  values  the doubles, 8 byte aligned, so they can be read into an array
+          in one copy or memory mapped without one
+"""
+
+from array import array
+import mmap
+import os
+import pickle
+import struct
+import sys
+
+MAGIC = b'QCKP'
+VERSION = 1
+HEADER = struct.Struct('<4sHBxQQQQ')
+
+
+def writeCheckpoint(path, index, values):
+    """
+    Writes index (a picklable object) and values (an array('d')) to path.
+    The file is written beside path and then renamed, so a run killed in
+    the middle of a save leaves the last checkpoint in place.
+    """
+    indexBytes = pickle.dumps(index, pickle.HIGHEST_PROTOCOL)
+    indexOffset = HEADER.size
+    valuesOffset = (indexOffset + len(indexBytes) + 7) // 8 * 8
+    byteOrder = sys.byteorder == 'little' and 1 or 2
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, byteOrder, indexOffset, len(indexBytes), valuesOffset, len(values)))
+        f.write(indexBytes)
+        f.write(b'\0' * (valuesOffset - indexOffset - len(indexBytes)))
+        values.tofile(f)
+    os.replace(temporary, path)
+
+
+def readCheckpoint(path, mapped=False):
+    """
+    Returns the (index, values) of the checkpoint at path.  values is an
+    array('d'), or with mapped=True a read only memoryview of the doubles
+    in a memory map of the file, which is only valid in the byte order the
+    file was written in.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise Exception('%s is not a checkpoint' % path)
+        magic, version, byteOrder, indexOffset, indexLength, valuesOffset, count = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise Exception('%s is not a checkpoint' % path)
+        if version != VERSION:
+            raise Exception('%s is a version %d checkpoint, expected version %d' % (path, version, VERSION))
+        f.seek(indexOffset)
+        index = pickle.loads(f.read(indexLength))
+        swapped = byteOrder != (sys.byteorder == 'little' and 1 or 2)
+        if mapped:
+            if swapped:
+                raise Exception('%s was written in the other byte order and cannot be mapped' % path)
+            if count == 0:
+                return index, memoryview(b'').cast('d')
+            # The map stays open for as long as the memoryview refers to it
+            view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            return index, view[valuesOffset:valuesOffset + 8 * count].cast('d')
+        f.seek(valuesOffset)
+        values = array('d')
+        values.fromfile(f, count)
+        if swapped:
+            values.byteswap()
+        return index, values
@@ -0,0 +1,138 @@
+# compiledMdp.py
+# --------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+A CompiledMDP is a snapshot of an mdp.MarkovDecisionProcess in flat arrays,
+so that value iteration can run over integers instead of calling back into
+the MDP for every state, action and transition:
+
+compiled = getCompiledMDP(mdp)
+values = compiled.bellmanBackup([0.0] * compiled.numStates, 0.9)
+
+States are numbered in the order of mdp.getStates().  Every (state, action)
+pair is a row; the rows of state i are rowStart[i] to rowStart[i + 1] and the
+transitions of row r are transStart[r] to transStart[r + 1], each with a next
+state number, a probability and a reward.  This is the sparse transition
+tensor in compressed sparse row form.
+
+buildPredecessors adds the reverse index: the transitions into state i are
+inStart[i] to inStart[i + 1], each with its row and probability, and the
+distinct states with a transition into i are predList[predStart[i]] to
+predList[predStart[i + 1] - 1].
+"""
+
+from array import array
+
+
+class CompiledMDP:
+    def __init__(self, mdp):
+        self.states = list(mdp.getStates())
+        self.stateIds = dict((state, i) for i, state in enumerate(self.states))
+        self.numStates = len(self.states)
+        self.terminal = [mdp.isTerminal(state) for state in self.states]
+
+        self.rowStart = array('l', [0])
+        self.rowAction = []
+        self.transStart = array('l', [0])
+        self.transNext = array('l')
+        self.transProb = array('d')
+        self.transReward = array('d')
+        stateIds = self.stateIds
+        for state, terminal in zip(self.states, self.terminal):
+            if not terminal:
+                for action in mdp.getPossibleActions(state):
+                    for nextState, prob in mdp.getTransitionStatesAndProbs(state, action):
+                        self.transNext.append(stateIds[nextState])
+                        self.transProb.append(prob)
+                        self.transReward.append(mdp.getReward(state, action, nextState))
+                    self.rowAction.append(action)
+                    self.transStart.append(len(self.transNext))
+            self.rowStart.append(len(self.rowAction))
+        self.numRows = len(self.rowAction)
+
+        # Slices of the transitions of each row, and of the rows of each state
+        # that has any, for the backup
+        self.rowState = array('l')
+        for i, start, end in zip(range(self.numStates), self.rowStart, self.rowStart[1:]):
+            self.rowState.extend([i] * (end - start))
+        self.rowSlices = [slice(start, end) for start, end in zip(self.transStart, self.transStart[1:])]
+        self.stateSlices = [(i, slice(start, end)) for i, start, end in
+                            zip(range(self.numStates), self.rowStart, self.rowStart[1:]) if start != end]
+
+    def qValue(self, row, values, discount):
+        "The Q-value of a row given a list of state values."
+        transNext, transProb, transReward = self.transNext, self.transProb, self.transReward
+        q = 0
+        for t in range(self.transStart[row], self.transStart[row + 1]):
+            q += transProb[t] * (transReward[t] + discount * values[transNext[t]])
+        return q
+
+    def buildPredecessors(self):
+        "Builds the reverse transition index described in the module docstring."
+        if hasattr(self, 'inStart'): return
+        incoming = [[] for _ in range(self.numStates)]
+        for row, start, end in zip(range(self.numRows), self.transStart, self.transStart[1:]):
+            for t in range(start, end):
+                incoming[self.transNext[t]].append((row, self.transProb[t]))
+        self.inStart = array('l', [0])
+        self.inRow = array('l')
+        self.inProb = array('d')
+        self.predStart = array('l', [0])
+        self.predList = array('l')
+        for transitions in incoming:
+            for row, prob in transitions:
+                self.inRow.append(row)
+                self.inProb.append(prob)
+            self.inStart.append(len(self.inRow))
+            self.predList.extend(sorted(set(self.rowState[row] for row, prob in transitions)))
+            self.predStart.append(len(self.predList))
+
+    def qValues(self, values, discount):
+        "The Q-value of every row given a list of state values."
+        returns = [prob * (reward + discount * values[nextState])
+                   for nextState, prob, reward in zip(self.transNext, self.transProb, self.transReward)]
+        return list(map(sum, map(returns.__getitem__, self.rowSlices)))
+
+    def bellmanBackup(self, values, discount):
+        """
+        Returns the values after one synchronous Bellman backup of the given
+        list of values.  Terminal states, and states without actions, keep
+        their value.  The arithmetic is that of
+        ValueIterationAgent.computeQValueFromValues, so the results match it
+        exactly.
+
+        Each step works on a whole array at once: the discounted return of
+        every transition, then the Q-value of every row, then the best row of
+        every state.
+        """
+        qValues = self.qValues(values, discount)
+        newValues = list(values)
+        for i, rows in self.stateSlices:
+            newValues[i] = max(qValues[rows])
+        return newValues
+
+    def rowsOf(self, state):
+        "The (row, action) pairs of a state."
+        i = self.stateIds[state]
+        return [(row, self.rowAction[row]) for row in range(self.rowStart[i], self.rowStart[i + 1])]
+
+
+def getCompiledMDP(mdp):
+    """
+    Returns a CompiledMDP for mdp, reusing the one the mdp keeps when it has
+    a getCompiledMDP method (as gridworld.Gridworld does).
+    """
+    if hasattr(mdp, 'getCompiledMDP'):
+        return mdp.getCompiledMDP()
+    return CompiledMDP(mdp)
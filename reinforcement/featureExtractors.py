@@ -15,8 +15,31 @@
 "Feature extractors for Pacman game states"
 
 from game import Directions, Actions
+import collections
+import heapq
 import util
 
+class FeatureRegistry:
+    """
+    Numbers feature names in the order they are first seen, so that a weight
+    vector can be an array indexed by feature number instead of a Counter
+    keyed by name.
+    """
+    def __init__(self, names=()):
+        self.names = list(names)
+        self.indices = dict(zip(self.names, range(len(self.names))))
+
+    def index(self, name):
+        "The number of name, giving it the next one if it has not been seen."
+        i = self.indices.get(name)
+        if i is None:
+            i = self.indices[name] = len(self.names)
+            self.names.append(name)
+        return i
+
+    def __len__(self):
+        return len(self.names)
+
 class FeatureExtractor:
     def getFeatures(self, state, action):
         """
@@ -26,6 +49,16 @@ class FeatureExtractor:
         """
         util.raiseNotDefined()
 
+    def getSparseFeatures(self, state, action, registry):
+        """
+          Returns the features of getFeatures as a pair of lists
+          (indices, values), with each feature name numbered by
+          the given FeatureRegistry.
+        """
+        features = self.getFeatures(state, action)
+        index = registry.index
+        return [index(f) for f in features], list(features.values())
+
 class IdentityExtractor(FeatureExtractor):
     def getFeatures(self, state, action):
         feats = util.Counter()
@@ -63,6 +96,85 @@ def closestFood(pos, food, walls):
     # no food found
     return None
 
+class FoodDistanceField:
+    """
+    The maze distance from every square of a layout to the nearest food, as
+    closestFood would find it, computed by one breadth first search out from
+    all the food at once.  Squares are numbered x * height + y; walls, and
+    squares with no food reachable, have distance None.
+
+    When a food is eaten, removeFood recomputes only the squares whose
+    nearest food it was, instead of searching the whole layout again.
+    """
+    def __init__(self, walls, food):
+        self.walls = walls
+        self.height = height = walls.height
+        self.neighbors = []
+        for x in range(walls.width):
+            for y in range(height):
+                if walls[x][y]:
+                    self.neighbors.append([])
+                else:
+                    self.neighbors.append([nx * height + ny for nx, ny in Actions.getLegalNeighbors((x, y), walls)
+                                           if (nx, ny) != (x, y)])
+        self.food = food.copy()
+        self.distances = [None] * len(self.neighbors)
+        fringe = collections.deque()
+        for x, y in food.asList():
+            self.distances[x * height + y] = 0
+            fringe.append(x * height + y)
+        distances, neighbors = self.distances, self.neighbors
+        while fringe:
+            square = fringe.popleft()
+            dist = distances[square] + 1
+            for nbr in neighbors[square]:
+                if distances[nbr] is None:
+                    distances[nbr] = dist
+                    fringe.append(nbr)
+
+    def getDistance(self, pos):
+        "The distance from pos to the nearest food, or None if there is none."
+        x, y = pos
+        return self.distances[x * self.height + y]
+
+    def removeFood(self, x, y):
+        """
+        Updates the distances after the food at (x, y) is eaten.  A square's
+        distance can only change if every neighbor one step closer to food
+        changes, so the squares that change are found in order of distance
+        out from (x, y), and then given their new distances by a search in
+        from the squares around them.
+        """
+        self.food[x][y] = False
+        distances, neighbors = self.distances, self.neighbors
+        level = [x * self.height + y]
+        changed = set(level)
+        dist = 0
+        while level:
+            candidates = set(nbr for square in level for nbr in neighbors[square]
+                             if distances[nbr] == dist + 1 and nbr not in changed)
+            level = [square for square in candidates
+                     if all(distances[nbr] != dist or nbr in changed for nbr in neighbors[square])]
+            changed.update(level)
+            dist += 1
+
+        for square in changed:
+            distances[square] = None
+        fringe = []
+        for square in changed:
+            reached = [distances[nbr] for nbr in neighbors[square] if distances[nbr] is not None]
+            if reached:
+                fringe.append((min(reached) + 1, square))
+        heapq.heapify(fringe)
+        while fringe:
+            dist, square = heapq.heappop(fringe)
+            if distances[square] is not None:
+                continue
+            distances[square] = dist
+            for nbr in neighbors[square]:
+                if distances[nbr] is None:
+                    heapq.heappush(fringe, (dist + 1, nbr))
+
 class SimpleExtractor(FeatureExtractor):
     """
     Returns simple features for a basic reflex Pacman:
@@ -72,6 +184,36 @@ class SimpleExtractor(FeatureExtractor):
     - whether a ghost is one step away
     """
 
+    def __init__(self):
+        self.foodField = None
+        self.foodFieldState = None
+
+    def getFoodField(self, state):
+        """
+        A FoodDistanceField for the food and walls of state.  The field of
+        the previous call is kept, and if the only difference is food eaten
+        at Pacman's position it is updated rather than built again.
+        """
+        if state is self.foodFieldState:
+            return self.foodField
+        food = state.getFood()
+        walls = state.getWalls()
+        field = self.foodField
+        if field is None or field.walls.data != walls.data:
+            field = FoodDistanceField(walls, food)
+        elif field.food.data != food.data:
+            eaten = [util.nearestPoint(state.getPacmanPosition())]
+            if state.data._foodEaten is not None:
+                eaten.append(state.data._foodEaten)
+            for x, y in eaten:
+                if field.food[x][y] and not food[x][y]:
+                    field.removeFood(x, y)
+            if field.food.data != food.data:
+                field = FoodDistanceField(walls, food)
+        self.foodField = field
+        self.foodFieldState = state
+        return field
+
     def getFeatures(self, state, action):
         # extract the grid of food and wall locations and get the ghost locations
         food = state.getFood()
@@ -87,14 +229,18 @@ class SimpleExtractor(FeatureExtractor):
         dx, dy = Actions.directionToVector(action)
         next_x, next_y = int(x + dx), int(y + dy)
 
-        # count the number of ghosts 1-step away
-        features["#-of-ghosts-1-step-away"] = sum((next_x, next_y) in Actions.getLegalNeighbors(g, walls) for g in ghosts)
+        # count the number of ghosts 1-step away: the squares a ghost can
+        # reach in a step are its own and the four around it
+        features["#-of-ghosts-1-step-away"] = 0
+        if not walls[next_x][next_y]:
+            features["#-of-ghosts-1-step-away"] = sum(abs(next_x - int(gx + 0.5)) + abs(next_y - int(gy + 0.5)) <= 1
+                                                      for gx, gy in ghosts)
 
         # if there is no danger of ghosts then add the food feature
         if not features["#-of-ghosts-1-step-away"] and food[next_x][next_y]:
             features["eats-food"] = 1.0
 
-        dist = closestFood((next_x, next_y), food, walls)
+        dist = self.getFoodField(state).getDistance((next_x, next_y))
         if dist is not None:
             # make the distance a number less than one otherwise the update
             # will diverge wildly
@@ -14,7 +14,9 @@
 
 import random
 import sys
+from array import array
 import mdp
+import compiledMdp
 import environment
 import util
 import optparse
@@ -31,6 +33,7 @@ class Gridworld(mdp.MarkovDecisionProcess):
         # parameters
         self.livingReward = 0.0
         self.noise = 0.2
+        self.clearCaches()
 
     def setLivingReward(self, reward):
         """
@@ -41,12 +44,32 @@ class Gridworld(mdp.MarkovDecisionProcess):
         future rewards.
         """
         self.livingReward = reward
+        self.clearCaches()
 
     def setNoise(self, noise):
         """
         The probability of moving in an unintended direction.
         """
         self.noise = noise
+        self.clearCaches()
+
+    def clearCaches(self):
+        """
+        Forgets the cached transitions and compiled tables.  The setters call
+        this; call it after changing the grid, noise or livingReward directly.
+        """
+        self._transitions = {}
+        self._compiled = None
+
+    def getCompiledMDP(self):
+        """
+        Returns the compiledMdp.CompiledMDP of this gridworld with its current
+        noise and living reward, built on first use.  Solvers that work on
+        the flat tables can share it instead of compiling their own.
+        """
+        if self._compiled is None:
+            self._compiled = compiledMdp.CompiledMDP(self)
+        return self._compiled
 
 
     def getPossibleActions(self, state):
@@ -117,8 +140,15 @@ class Gridworld(mdp.MarkovDecisionProcess):
         representing the states reachable
         from 'state' by taking 'action' along
         with their transition probabilities.
+
+        The lists are computed once and cached, so they must not be modified.
         """
+        transitions = self._transitions.get((state, action))
+        if transitions is None:
+            transitions = self._transitions[(state, action)] = self.__computeTransitionStatesAndProbs(state, action)
+        return transitions
 
+    def __computeTransitionStatesAndProbs(self, state, action):
         if action not in self.getPossibleActions(state):
             raise Exception("Illegal action!")
 
@@ -377,6 +407,38 @@ def runEpisode(agent, environment, discount, decision, display, message, pause,
     if 'stopEpisode' in dir(agent):
         agent.stopEpisode()
 
+def runEpisodesHeadless(agent, environment, discount, numEpisodes, rng):
+    """
+    Runs numEpisodes episodes with no display, pausing or messages and
+    returns the discounted return of each in an array.  Transitions are
+    sampled from rng (a random.Random), so the environment has its own
+    random stream; the agent explores with the random module as usual.
+
+    Unlike runEpisode, this calls agent.stopEpisode() after every episode, so
+    a learning agent stops exploring and learning after numTraining episodes.
+    """
+    returns = array('d', bytes(8 * numEpisodes))
+    getPossibleActions = environment.getPossibleActions
+    getRandomNextState = environment.getRandomNextState
+    for episode in range(numEpisodes):
+        environment.reset()
+        agent.startEpisode()
+        state = environment.getCurrentState()
+        total, totalDiscount = 0.0, 1.0
+        while getPossibleActions(state):
+            action = agent.getAction(state)
+            if action == None:
+                raise Exception('Error: Agent returned None action')
+            nextState, reward = getRandomNextState(state, action, rng)
+            environment.state = nextState
+            agent.observeTransition(state, action, nextState, reward)
+            total += reward * totalDiscount
+            totalDiscount *= discount
+            state = nextState
+        agent.stopEpisode()
+        returns[episode] = total
+    return returns
+
 def parseOptions():
     optParser = optparse.OptionParser()
     optParser.add_option('-d', '--discount',action='store',
@@ -514,6 +576,8 @@ if __name__ == '__main__':
         a = valueIterationAgents.AsynchronousValueIterationAgent(mdp, opts.discount, opts.iters)
     elif opts.agent == 'priosweepvalue':
         a = valueIterationAgents.PrioritizedSweepingValueIterationAgent(mdp, opts.discount, opts.iters)
+    elif opts.agent == 'compiledvalue':
+        a = valueIterationAgents.CompiledValueIterationAgent(mdp, opts.discount, opts.iters)
     else:
         if not opts.manual: raise Exception('Unknown agent type: '+opts.agent)
 
@@ -523,7 +587,7 @@ if __name__ == '__main__':
     ###########################
     # DISPLAY Q/V VALUES BEFORE SIMULATION OF EPISODES
     try:
-        if not opts.manual and opts.agent in ('value', 'asynchvalue', 'priosweepvalue'):
+        if not opts.manual and opts.agent in ('value', 'asynchvalue', 'priosweepvalue', 'compiledvalue'):
             if opts.valueSteps:
                 for i in range(opts.iters):
                     tempAgent = valueIterationAgents.ValueIterationAgent(mdp, opts.discount, i)
@@ -545,7 +609,7 @@ if __name__ == '__main__':
         if opts.manual and opts.agent == None:
             displayCallback = lambda state: display.displayNullValues(state)
         else:
-            if opts.agent in ('random', 'value', 'asynchvalue', 'priosweepvalue'):
+            if opts.agent in ('random', 'value', 'asynchvalue', 'priosweepvalue', 'compiledvalue'):
                 displayCallback = lambda state: display.displayValues(a, state, "CURRENT VALUES")
             if opts.agent == 'q': displayCallback = lambda state: display.displayQValues(a, state, "CURRENT Q-VALUES")
 
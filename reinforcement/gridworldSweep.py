@@ -0,0 +1,161 @@
+# gridworldSweep.py
+# -----------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Headless Q-learning sweeps over gridworlds.
+
+Every combination of learning rate, exploration rate and seed is trained for
+the given number of episodes with gridworld.runEpisodesHeadless, optionally
+spread over several processes, and the learning curves are written as CSV:
+one row per configuration and window of episodes, with the mean return over
+the window.
+
+> python gridworldSweep.py -g BookGrid -k 10000 --alphas 0.2,0.5 --epsilons 0.1,0.3 --seeds 4
+> python gridworldSweep.py -g CliffGrid -k 20000 --workers 4 --window 500 --csv cliff.csv
+
+Each configuration gets its own environment and exploration seeds, drawn
+from --seed before anything runs, so the curves do not depend on --workers.
+"""
+
+import csv
+import random
+import sys
+import time
+
+import gridworld
+import qlearningAgents
+
+
+class TrainingConfiguration:
+    """
+    One training run: a grid with its parameters, the agent's learning and
+    exploration rates, and the seeds of its two random streams.
+    """
+    def __init__(self, grid, discount, noise, livingReward, alpha, epsilon, seed, episodes,
+                 environmentSeed, agentSeed):
+        self.grid = grid
+        self.discount = discount
+        self.noise = noise
+        self.livingReward = livingReward
+        self.alpha = alpha
+        self.epsilon = epsilon
+        self.seed = seed
+        self.episodes = episodes
+        self.environmentSeed = environmentSeed
+        self.agentSeed = agentSeed
+
+
+def makeConfigurations(grid, discount, noise, livingReward, alphas, epsilons, numSeeds, episodes, masterSeed=0):
+    seeds = random.Random(masterSeed)
+    configurations = []
+    for alpha in alphas:
+        for epsilon in epsilons:
+            for seed in range(numSeeds):
+                configurations.append(TrainingConfiguration(grid, discount, noise, livingReward, alpha, epsilon,
+                                                            seed, episodes, seeds.getrandbits(32),
+                                                            seeds.getrandbits(32)))
+    return configurations
+
+
+def runConfiguration(configuration):
+    "Trains one Q-learning agent and returns (configuration, returns per episode)."
+    mdp = getattr(gridworld, 'get' + configuration.grid)()
+    mdp.setNoise(configuration.noise)
+    mdp.setLivingReward(configuration.livingReward)
+    environment = gridworld.GridworldEnvironment(mdp)
+    agent = qlearningAgents.QLearningAgent(actionFn=mdp.getPossibleActions, gamma=configuration.discount,
+                                           alpha=configuration.alpha, epsilon=configuration.epsilon,
+                                           numTraining=configuration.episodes)
+    random.seed(configuration.agentSeed)
+    returns = gridworld.runEpisodesHeadless(agent, environment, configuration.discount, configuration.episodes,
+                                            random.Random(configuration.environmentSeed))
+    return configuration, returns
+
+
+def runConfigurations(configurations, workers):
+    """
+    Runs every configuration, in a pool of worker processes when workers > 1,
+    and returns the results in the order of configurations.
+    """
+    if workers <= 1:
+        return [runConfiguration(c) for c in configurations]
+    import multiprocessing
+    pool = multiprocessing.Pool(workers)
+    try:
+        return pool.map(runConfiguration, configurations, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def writeLearningCurves(results, window, out):
+    writer = csv.writer(out)
+    writer.writerow(['grid', 'alpha', 'epsilon', 'seed', 'episode', 'meanReturn'])
+    for configuration, returns in results:
+        for start in range(0, len(returns), window):
+            chunk = returns[start:start + window]
+            writer.writerow([configuration.grid, configuration.alpha, configuration.epsilon, configuration.seed,
+                             start + len(chunk), '%.6f' % (sum(chunk) / len(chunk))])
+
+
+def readCommand(argv):
+    from optparse import OptionParser
+    parser = OptionParser(__doc__)
+    parser.add_option('-g', '--grid', dest='grid', default='BookGrid',
+                      help='grid to train on (default %default)')
+    parser.add_option('-k', '--episodes', dest='episodes', type='int', default=1000,
+                      help='training episodes per configuration (default %default)')
+    parser.add_option('-d', '--discount', dest='discount', type='float', default=0.9,
+                      help='discount on future (default %default)')
+    parser.add_option('-n', '--noise', dest='noise', type='float', default=0.2,
+                      help='how often an action results in an unintended direction (default %default)')
+    parser.add_option('-r', '--livingReward', dest='livingReward', type='float', default=0.0,
+                      help='reward for living for a time step (default %default)')
+    parser.add_option('--alphas', dest='alphas', default='0.5',
+                      help='comma separated learning rates (default %default)')
+    parser.add_option('--epsilons', dest='epsilons', default='0.3',
+                      help='comma separated exploration rates (default %default)')
+    parser.add_option('--seeds', dest='seeds', type='int', default=1,
+                      help='seeds per learning and exploration rate (default %default)')
+    parser.add_option('--seed', dest='seed', type='int', default=0,
+                      help='seed that the per configuration seeds are drawn from (default %default)')
+    parser.add_option('--workers', dest='workers', type='int', default=1,
+                      help='number of processes to train in (default %default)')
+    parser.add_option('--window', dest='window', type='int', default=100,
+                      help='episodes averaged into each learning curve point (default %default)')
+    parser.add_option('--csv', dest='csv', default=None,
+                      help='file to write the learning curves to (default standard output)')
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        raise Exception('Command line input not understood: ' + str(otherjunk))
+    return options
+
+
+if __name__ == '__main__':
+    options = readCommand(sys.argv[1:])
+    configurations = makeConfigurations(options.grid, options.discount, options.noise, options.livingReward,
+                                        [float(a) for a in options.alphas.split(',')],
+                                        [float(e) for e in options.epsilons.split(',')],
+                                        options.seeds, options.episodes, options.seed)
+    start = time.time()
+    results = runConfigurations(configurations, options.workers)
+    elapsed = time.time() - start
+    if options.csv:
+        with open(options.csv, 'w', newline='') as out:
+            writeLearningCurves(results, options.window, out)
+    else:
+        writeLearningCurves(results, options.window, sys.stdout)
+    totalEpisodes = len(configurations) * options.episodes
+    sys.stderr.write('%d configurations, %d episodes in %.2fs (%.0f episodes/sec)\n' %
+                     (len(configurations), totalEpisodes, elapsed, totalEpisodes / max(elapsed, 1e-9)))
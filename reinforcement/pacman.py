@@ -554,6 +554,10 @@ def readCommand(argv):
                       help='Turns on exception handling and timeouts during games', default=False)
     parser.add_option('--timeout', dest='timeout', type='int',
                       help=default('Maximum length of time an agent can spend computing in a single game'), default=30)
+    parser.add_option('--trainWorkers', dest='trainWorkers', type='int',
+                      help=default('Number of processes to play the training episodes in (see parallelTraining.py)'), default=1)
+    parser.add_option('--syncEvery', dest='syncEvery', type='int',
+                      help=default('Training episodes each process plays between weight synchronizations'), default=10)
 
     options, otherjunk = parser.parse_args(argv)
     if len(otherjunk) != 0:
@@ -606,6 +610,8 @@ def readCommand(argv):
     args['record'] = options.record
     args['catchExceptions'] = options.catchExceptions
     args['timeout'] = options.timeout
+    args['trainWorkers'] = options.trainWorkers
+    args['syncEvery'] = options.syncEvery
 
     # Special case: recorded games don't use the runGames method or args structure
     if options.gameToReplay != None:
@@ -672,10 +678,17 @@ def replayGame(layout, actions, display):
     display.finish()
 
 
-def runGames(layout, pacman, ghosts, display, numGames, record, numTraining=0, catchExceptions=False, timeout=30):
+def runGames(layout, pacman, ghosts, display, numGames, record, numTraining=0, catchExceptions=False, timeout=30,
+             trainWorkers=1, syncEvery=10):
     import __main__
     __main__.__dict__['_display'] = display
 
+    if trainWorkers > 1 and numTraining > 0:
+        import parallelTraining
+        parallelTraining.trainInParallel(pacman, layout, ghosts, numTraining, trainWorkers, syncEvery)
+        numGames -= numTraining
+        numTraining = 0
+
     rules = ClassicGameRules(timeout)
     games = []
 
@@ -0,0 +1,228 @@
+# parallelTraining.py
+# -------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Trains a PacmanQAgent or ApproximateQAgent with several actor processes.
+
+Training runs in rounds.  At the start of a round the learner sends each
+actor the current parameters: the weights of an ApproximateQAgent, or the
+Q-values of a PacmanQAgent.  Each actor then plays --syncEvery training
+episodes with its own copy of the agent, learning as it goes, and sends
+back how far its parameters moved.  The learner adds the moves of all the
+actors, in actor order, to its parameters and starts the next round.
+
+pacman.py uses this when given --trainWorkers:
+
+python pacman.py -p ApproximateQAgent -a extractor=SimpleExtractor -x 200 -n 210 -l mediumGrid --trainWorkers 4
+
+Run on its own, it reports training throughput for each number of workers:
+
+> python parallelTraining.py -p ApproximateQAgent -a extractor=SimpleExtractor -l mediumGrid -x 200 --workers 1,2,4
+
+Every actor's random stream is seeded from --seed, and the actors' moves
+are combined in a fixed order, so a run is repeatable for a given seed,
+number of workers and --syncEvery.  The agent is copied into the actors
+when they start, so the actors are always forked, and parallel training
+is not available on platforms without the fork start method (Windows).
+"""
+
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+import pacman
+import qlearningAgents
+import textDisplay
+
+
+def getParameters(agent):
+    """
+    The learned parameters of agent as a util.Counter: the weights of an
+    ApproximateQAgent, or the Q-values of a QLearningAgent.
+    """
+    if isinstance(agent, qlearningAgents.ApproximateQAgent):
+        return agent.getWeights()
+    if agent.dense:
+        raise Exception('Parallel training needs the counter Q-table, not qTable=dense')
+    return agent.values.copy()
+
+
+def setParameters(agent, parameters):
+    if isinstance(agent, qlearningAgents.ApproximateQAgent):
+        agent.setWeights(parameters)
+    else:
+        agent.values = parameters.copy()
+
+
+def parameterChanges(before, after):
+    "The parameters that differ between before and after, as a dict of after - before."
+    return dict((key, value - before[key]) for key, value in after.items() if value != before[key])
+
+
+def _actor(agent, layout, ghosts, seed, tasks, results):
+    """
+    Runs in an actor process: plays the episodes of each task it is sent,
+    starting from the task's parameters, until it is sent None.
+    """
+    sys.stdout = open(os.devnull, 'w')
+    agent.checkpoint = None
+    random.seed(seed)
+    rules = pacman.ClassicGameRules()
+    display = textDisplay.NullGraphics()
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        parameters, numEpisodes = task
+        setParameters(agent, parameters)
+        episodes = []
+        for _ in range(numEpisodes):
+            game = rules.newGame(layout, agent, ghosts, display, True)
+            game.run()
+            episodes.append((game.state.isWin(), game.state.getScore()))
+        results.put((parameterChanges(parameters, getParameters(agent)), episodes))
+
+
+def getForkContext():
+    """
+    The multiprocessing context that starts actors by forking, which copies
+    the agent and everything it refers to into them.
+    """
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        raise Exception('Parallel training needs the fork start method, which this platform does not have')
+    return multiprocessing.get_context('fork')
+
+
+def trainInParallel(agent, layout, ghosts, numEpisodes, workers, syncEvery=10, seed=0):
+    """
+    Trains agent for numEpisodes episodes spread over workers actor
+    processes, synchronizing every syncEvery episodes per actor, and leaves
+    it as if it had played them itself.  Returns the (won, score) of every
+    episode, round by round and actor by actor within a round.
+    """
+    seeds = random.Random(seed)
+    actorSeeds = [seeds.getrandbits(32) for _ in range(workers)]
+    parameters = getParameters(agent)
+    context = getForkContext()
+    tasks = [context.Queue() for _ in range(workers)]
+    results = [context.Queue() for _ in range(workers)]
+    actors = [context.Process(target=_actor, args=(agent, layout, ghosts, actorSeeds[i], tasks[i], results[i]))
+              for i in range(workers)]
+    for actor in actors:
+        actor.daemon = True
+        actor.start()
+    episodes = []
+    try:
+        remaining = numEpisodes
+        while remaining > 0:
+            counts = [min(syncEvery, max(0, remaining - i * syncEvery)) for i in range(workers)]
+            counts = [count for count in counts if count > 0]
+            for i, count in enumerate(counts):
+                tasks[i].put((parameters, count))
+            roundResults = [results[i].get() for i in range(len(counts))]
+            for changes, actorEpisodes in roundResults:
+                for key, change in changes.items():
+                    parameters[key] += change
+                episodes.extend(actorEpisodes)
+            remaining -= sum(counts)
+    finally:
+        for queue in tasks:
+            queue.put(None)
+        for actor in actors:
+            actor.join()
+
+    setParameters(agent, parameters)
+    agent.episodesSoFar += numEpisodes
+    agent.accumTrainRewards += sum(score for won, score in episodes)
+    if agent.episodesSoFar >= agent.numTraining:
+        agent.epsilon = 0.0
+        agent.alpha = 0.0
+    if agent.checkpoint and agent.checkpointEvery > 0:
+        agent.saveCheckpoint(agent.checkpoint)
+    return episodes
+
+
+def _trainSerially(agent, layout, ghosts, numEpisodes, seed):
+    "Trains agent in this process, as pacman.py does without --trainWorkers."
+    random.seed(seed)
+    rules = pacman.ClassicGameRules()
+    episodes = []
+    for _ in range(numEpisodes):
+        game = rules.newGame(layout, agent, ghosts, textDisplay.NullGraphics(), True)
+        game.run()
+        episodes.append((game.state.isWin(), game.state.getScore()))
+    return episodes
+
+
+def readCommand(argv):
+    from optparse import OptionParser
+    parser = OptionParser(__doc__)
+    parser.add_option('-l', '--layout', dest='layout', default='mediumGrid',
+                      help='layout to train on (default %default)')
+    parser.add_option('-p', '--pacman', dest='pacman', default='ApproximateQAgent',
+                      help='agent to train, from qlearningAgents (default %default)')
+    parser.add_option('-a', '--agentArgs', dest='agentArgs', default='extractor=SimpleExtractor',
+                      help='comma separated arguments for the agent (default %default)')
+    parser.add_option('-g', '--ghosts', dest='ghost', default='RandomGhost',
+                      help='ghost agent type (default %default)')
+    parser.add_option('-k', '--numghosts', dest='numGhosts', type='int', default=4,
+                      help='maximum number of ghosts (default %default)')
+    parser.add_option('-x', '--numTraining', dest='numTraining', type='int', default=200,
+                      help='training episodes per run (default %default)')
+    parser.add_option('--workers', dest='workers', default='1,2,4',
+                      help='comma separated numbers of actor processes to time (default %default)')
+    parser.add_option('--syncEvery', dest='syncEvery', type='int', default=10,
+                      help='episodes each actor plays between synchronizations (default %default)')
+    parser.add_option('--seed', dest='seed', type='int', default=0,
+                      help='seed the actor seeds are drawn from (default %default)')
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        raise Exception('Command line input not understood: ' + str(otherjunk))
+    return options
+
+
+if __name__ == '__main__':
+    options = readCommand(sys.argv[1:])
+    import layout
+    import ghostAgents
+    lay = layout.getLayout(options.layout)
+    if lay == None:
+        raise Exception("The layout " + options.layout + " cannot be found")
+    ghosts = [getattr(ghostAgents, options.ghost)(i + 1) for i in range(options.numGhosts)]
+    agentOpts = pacman.parseAgentArgs(options.agentArgs)
+    agentOpts['numTraining'] = options.numTraining
+
+    print('%d training episodes on %s, %d cores' % (options.numTraining, options.layout, multiprocessing.cpu_count()))
+    print('%-10s %10s %12s %14s %14s' % ('workers', 'seconds', 'episodes/sec', 'win rate', 'last 50 wins'))
+    runs = [('serial', None)] + [(w, int(w)) for w in options.workers.split(',')]
+    for name, workers in runs:
+        agent = getattr(qlearningAgents, options.pacman)(**agentOpts)
+        start = time.perf_counter()
+        stdout = sys.stdout
+        sys.stdout = open(os.devnull, 'w')
+        try:
+            if workers is None:
+                episodes = _trainSerially(agent, lay, ghosts, options.numTraining, options.seed)
+            else:
+                episodes = trainInParallel(agent, lay, ghosts, options.numTraining, workers, options.syncEvery,
+                                           options.seed)
+        finally:
+            sys.stdout = stdout
+        elapsed = time.perf_counter() - start
+        wins = [won for won, score in episodes]
+        print('%-10s %10.2f %12.1f %14.2f %11d/%d' % (name, elapsed, len(episodes) / elapsed,
+                                                      sum(wins) / float(len(wins)), sum(wins[-50:]),
+                                                      len(wins[-50:])))
@@ -0,0 +1,149 @@
+# qTables.py
+# ----------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+A DenseQTable holds Q-values in one flat array instead of a util.Counter
+keyed by (state, action).  QLearningAgent uses one when given qTable='dense':
+
+python pacman.py -p PacmanQAgent -x 2000 -n 2010 -l smallGrid -a qTable=dense
+
+It supports the same table[(state, action)] reads and writes as a Counter,
+with unseen entries reading as 0.0, and adds maxValue and bestAction, which
+QLearningAgent uses instead of looping over getLegalActions.
+"""
+
+from array import array
+
+
+class DenseQTable:
+    """
+    States and actions are given integer ids the first time they are seen,
+    and the Q-value of (state, action) is values[stateId * width + actionId].
+    The legal actions of a state are looked up once, when it is first seen,
+    and kept as the state's action mask; a state's legal actions must not
+    change over time (true of gridworlds, the crawler and Pacman states).
+    When a new action needs a column the width doubles and the table is
+    copied, which only happens while the action set is still being learned.
+    """
+
+    def __init__(self, actionFn):
+        self.actionFn = actionFn
+        self.stateIds = {}
+        self.states = []
+        self.actionIds = {}
+        self.actions = []
+        self.legalActions = []
+        self.legalColumns = []
+        self.width = 1
+        self.values = array('d')
+
+    def stateId(self, state):
+        "The id of state, adding a row for it if it has not been seen."
+        sid = self.stateIds.get(state)
+        if sid is None:
+            legal = list(self.actionFn(state))
+            columns = [self.actionId(action) for action in legal]
+            sid = self.stateIds[state] = len(self.states)
+            self.states.append(state)
+            self.legalActions.append(legal)
+            self.legalColumns.append(columns)
+            self.values.extend(array('d', bytes(8 * self.width)))
+        return sid
+
+    def actionId(self, action):
+        "The column of action, widening the table if it has not been seen."
+        aid = self.actionIds.get(action)
+        if aid is None:
+            aid = self.actionIds[action] = len(self.actions)
+            self.actions.append(action)
+            if aid >= self.width:
+                self._widen(2 * self.width)
+        return aid
+
+    def _widen(self, width):
+        values = array('d', bytes(8 * width * len(self.states)))
+        for sid in range(len(self.states)):
+            values[sid * width:sid * width + self.width] = self.values[sid * self.width:(sid + 1) * self.width]
+        self.values = values
+        self.width = width
+
+    def load(self, states, actions, legalSets, stateLegalSets, width, values):
+        """
+        Replaces the contents of the table with a saved one: its states, its
+        actions, the distinct lists of legal action columns, the number of
+        each state's list in an array, its width and its values array.  This
+        is how checkpoints.py stores a table; states with the same legal
+        actions share one list.
+        """
+        self.states = list(states)
+        self.stateIds = dict(zip(self.states, range(len(self.states))))
+        self.actions = list(actions)
+        self.actionIds = dict(zip(self.actions, range(len(self.actions))))
+        legalSets = [list(columns) for columns in legalSets]
+        legalActionSets = [list(map(self.actions.__getitem__, columns)) for columns in legalSets]
+        self.legalColumns = list(map(legalSets.__getitem__, stateLegalSets))
+        self.legalActions = list(map(legalActionSets.__getitem__, stateLegalSets))
+        self.width = width
+        self.values = array('d', values)
+
+    def legalSets(self):
+        "The (legalSets, stateLegalSets) that load takes."
+        setIds = {}
+        stateLegalSets = array('l', [setIds.setdefault(tuple(columns), len(setIds)) for columns in self.legalColumns])
+        return list(setIds), stateLegalSets
+
+    def __getitem__(self, key):
+        state, action = key
+        sid = self.stateIds.get(state)
+        aid = self.actionIds.get(action)
+        if sid is None or aid is None:
+            return 0.0
+        return self.values[sid * self.width + aid]
+
+    def __setitem__(self, key, value):
+        state, action = key
+        sid = self.stateId(state)
+        aid = self.actionId(action)
+        self.values[sid * self.width + aid] = value
+
+    def __len__(self):
+        return len(self.states) * len(self.actions)
+
+    def items(self):
+        "((state, action), value) for every legal action of every state seen."
+        for sid, state in enumerate(self.states):
+            for action, aid in zip(self.legalActions[sid], self.legalColumns[sid]):
+                yield (state, action), self.values[sid * self.width + aid]
+
+    def maxValue(self, state):
+        "The largest Q-value over the legal actions of state, or 0.0 if it has none."
+        sid = self.stateId(state)
+        columns = self.legalColumns[sid]
+        if not columns:
+            return 0.0
+        start = sid * self.width
+        return max(map(self.values[start:start + self.width].__getitem__, columns))
+
+    def bestAction(self, state):
+        """
+        The legal action of state with the largest Q-value, the first in legal
+        order on ties, or None if it has no legal actions.
+        """
+        sid = self.stateId(state)
+        columns = self.legalColumns[sid]
+        if not columns:
+            return None
+        start = sid * self.width
+        qValues = list(map(self.values[start:start + self.width].__getitem__, columns))
+        return self.legalActions[sid][qValues.index(max(qValues))]
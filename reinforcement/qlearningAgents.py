@@ -16,7 +16,11 @@ from game import *
 from learningAgents import ReinforcementAgent
 from featureExtractors import *
 
-import random, util, math
+import random, util, math, operator, os
+from array import array
+import checkpoints
+import qTables
+import replayBuffer
 
 
 class QLearningAgent(ReinforcementAgent):
@@ -40,12 +44,29 @@ class QLearningAgent(ReinforcementAgent):
           which returns legal actions for a state
     """
 
-    def __init__(self, **args):
-        "You can initialize Q-values here..."
+    def __init__(self, qTable='counter', checkpoint=None, checkpointEvery='0', **args):
+        """
+        You can initialize Q-values here...
+
+        qTable='dense' keeps the Q-values in a qTables.DenseQTable instead of
+        a util.Counter.
+
+        checkpoint is a checkpoints.py file to start from, if it exists, and
+        with checkpointEvery > 0 to save to every that many training
+        episodes and at the end of training.
+        """
         ReinforcementAgent.__init__(self, **args)
 
         "*** YOUR CODE HERE ***"
-        self.values = util.Counter()
+        self.dense = qTable == 'dense'
+        if self.dense:
+            self.values = qTables.DenseQTable(self.getLegalActions)
+        else:
+            self.values = util.Counter()
+        self.checkpoint = checkpoint
+        self.checkpointEvery = int(checkpointEvery)
+        if checkpoint and os.path.exists(checkpoint):
+            self.loadCheckpoint(checkpoint)
 
     def getQValue(self, state, action):
         """
@@ -64,6 +85,8 @@ class QLearningAgent(ReinforcementAgent):
           terminal state, you should return a value of 0.0.
         """
         "*** YOUR CODE HERE ***"
+        if self.dense:
+            return self.values.maxValue(state)
         possible_actions = self.getLegalActions(state)
 
         q_value = 0 if not possible_actions else max(self.getQValue(state, action) for action in possible_actions)
@@ -76,6 +99,8 @@ class QLearningAgent(ReinforcementAgent):
           you should return None.
         """
         "*** YOUR CODE HERE ***"
+        if self.dense:
+            return self.values.bestAction(state)
         best_action = None
         max_value = float('-inf')
         for action in self.getLegalActions(state):
@@ -121,6 +146,58 @@ class QLearningAgent(ReinforcementAgent):
         reward = self.alpha * reward
         self.values[(state, action)] = old_part + reward + next_state_part
 
+    def stopEpisode(self):
+        ReinforcementAgent.stopEpisode(self)
+        if self.checkpoint and self.checkpointEvery > 0 and self.episodesSoFar <= self.numTraining:
+            if self.episodesSoFar % self.checkpointEvery == 0 or self.episodesSoFar == self.numTraining:
+                self.saveCheckpoint(self.checkpoint)
+
+    def saveCheckpoint(self, path):
+        "Writes the Q-values to path in the format of checkpoints.py."
+        if self.dense:
+            table = self.values
+            legalSets, stateLegalSets = table.legalSets()
+            index = {'kind': 'dense', 'episodes': self.episodesSoFar, 'states': table.states,
+                     'actions': table.actions, 'legalSets': legalSets, 'stateLegalSets': stateLegalSets,
+                     'width': table.width}
+            checkpoints.writeCheckpoint(path, index, table.values)
+        else:
+            # Each key is stored as the numbers of its state and action
+            keys = list(self.values)
+            keyStates = list(map(operator.itemgetter(0), keys))
+            keyActions = list(map(operator.itemgetter(1), keys))
+            states = list(dict.fromkeys(keyStates))
+            actions = list(dict.fromkeys(keyActions))
+            stateIds = dict(zip(states, range(len(states))))
+            actionIds = dict(zip(actions, range(len(actions))))
+            index = {'kind': 'qvalues', 'episodes': self.episodesSoFar, 'states': states, 'actions': actions,
+                     'keyStates': array('l', map(stateIds.__getitem__, keyStates)),
+                     'keyActions': array('l', map(actionIds.__getitem__, keyActions))}
+            checkpoints.writeCheckpoint(path, index, array('d', self.values.values()))
+
+    def loadCheckpoint(self, path):
+        "Replaces the Q-values with those saved at path by saveCheckpoint, with either Q-table."
+        index, values = checkpoints.readCheckpoint(path)
+        if index['kind'] == 'dense':
+            table = qTables.DenseQTable(self.getLegalActions)
+            table.load(index['states'], index['actions'], index['legalSets'], index['stateLegalSets'],
+                       index['width'], values)
+            if self.dense:
+                self.values = table
+            else:
+                self.values = util.Counter(table.items())
+        elif index['kind'] == 'qvalues':
+            keys = zip(map(index['states'].__getitem__, index['keyStates']),
+                       map(index['actions'].__getitem__, index['keyActions']))
+            if self.dense:
+                self.values = qTables.DenseQTable(self.getLegalActions)
+                for key, value in zip(keys, values):
+                    self.values[key] = value
+            else:
+                self.values = util.Counter(zip(keys, values))
+        else:
+            raise Exception('%s holds %s, not Q-values' % (path, index['kind']))
+
     def getPolicy(self, state):
         return self.computeActionFromQValues(state)
 
@@ -169,13 +246,79 @@ class ApproximateQAgent(PacmanQAgent):
        should work as is.
     """
 
-    def __init__(self, extractor='IdentityExtractor', **args):
+    def __init__(self, extractor='IdentityExtractor', replay='0', batchSize='32', replayEvery='1', **args):
+        """
+        replay > 0 keeps that many transitions in a replayBuffer.ReplayBuffer
+        and learns from minibatches of batchSize of them, one every
+        replayEvery steps, instead of from each transition as it happens.
+        """
         self.featExtractor = util.lookup(extractor, globals())()
+        # Weights are kept in an array indexed by the feature numbers of
+        # featureRegistry, and features as (indices, values) pairs
+        self.featureRegistry = FeatureRegistry()
+        self.weightVector = array('d')
+        self.featureCache = []
         PacmanQAgent.__init__(self, **args)
-        self.weights = util.Counter()
+        self.replayBuffer = None
+        if int(replay) > 0:
+            self.replayBuffer = replayBuffer.ReplayBuffer(int(replay))
+        self.batchSize = int(batchSize)
+        self.replayEvery = int(replayEvery)
+        self.replaySteps = 0
 
     def getWeights(self):
-        return self.weights
+        "The weights as a util.Counter from feature names to weights."
+        weights = util.Counter()
+        for name, weight in zip(self.featureRegistry.names, self.weightVector):
+            weights[name] = weight
+        return weights
+
+    def setWeights(self, weights):
+        "Replaces the weights with those of a dict from feature names to weights."
+        self.weightVector = array('d', bytes(8 * len(self.featureRegistry)))
+        for name, weight in weights.items():
+            i = self.featureRegistry.index(name)
+            if i >= len(self.weightVector):
+                self.weightVector.extend([0.0] * (i + 1 - len(self.weightVector)))
+            self.weightVector[i] = weight
+
+    def saveCheckpoint(self, path):
+        "Writes the weights to path in the format of checkpoints.py."
+        index = {'kind': 'weights', 'episodes': self.episodesSoFar, 'names': self.featureRegistry.names}
+        checkpoints.writeCheckpoint(path, index, self.weightVector)
+
+    def loadCheckpoint(self, path):
+        "Replaces the weights with those saved at path by saveCheckpoint."
+        index, values = checkpoints.readCheckpoint(path)
+        if index['kind'] != 'weights':
+            raise Exception('%s holds %s, not weights' % (path, index['kind']))
+        self.featureRegistry = FeatureRegistry(index['names'])
+        self.weightVector = values
+        self.featureCache = []
+
+    def getSparseFeatures(self, state, action):
+        """
+          The (indices, values) features of (state, action), extracted once
+          and remembered for the two most recent states.  Each step scores
+          every action of the new state, first in update and then in
+          getAction, and the previous state's action again in update, so
+          no features are extracted twice.  States are matched by identity:
+          the game hands the agent one fresh copy of the state per step.
+        """
+        cache = self.featureCache
+        for cachedState, features in cache:
+            if cachedState is state:
+                break
+        else:
+            features = {}
+            cache.insert(0, (state, features))
+            del cache[2:]
+        sparse = features.get(action)
+        if sparse is None:
+            sparse = features[action] = self.featExtractor.getSparseFeatures(state, action, self.featureRegistry)
+            if len(self.weightVector) < len(self.featureRegistry):
+                self.weightVector.extend([0.0] * (len(self.featureRegistry) - len(self.weightVector)))
+        return sparse
 
     def getQValue(self, state, action):
         """
@@ -183,19 +326,36 @@ class ApproximateQAgent(PacmanQAgent):
           where * is the dotProduct operator
         """
         "*** YOUR CODE HERE ***"
-        w = self.getWeights()
-        feature_vector = self.featExtractor.getFeatures(state, action)
-        return w * feature_vector
+        indices, values = self.getSparseFeatures(state, action)
+        return sum(map(operator.mul, map(self.weightVector.__getitem__, indices), values))
 
     def update(self, state, action, nextState, reward):
         """
            Should update your weights based on transition
         """
         "*** YOUR CODE HERE ***"
+        if self.replayBuffer is not None:
+            self.replayBuffer.add(self.getSparseFeatures(state, action), reward,
+                                  [self.getSparseFeatures(nextState, a) for a in self.getLegalActions(nextState)])
+            self.replaySteps += 1
+            if len(self.replayBuffer) >= self.batchSize and self.replaySteps % self.replayEvery == 0:
+                self.replayUpdate()
+            return
         diff = (reward + self.discount * self.computeValueFromQValues(nextState)) - self.getQValue(state, action)
-        feature_vector = self.featExtractor.getFeatures(state, action)
-        for f in feature_vector:
-            self.weights[f] = self.weights[f] + self.alpha * diff * feature_vector[f]
+        indices, values = self.getSparseFeatures(state, action)
+        weights = self.weightVector
+        step = self.alpha * diff
+        for i, value in zip(indices, values):
+            weights[i] += step * value
+
+    def replayUpdate(self):
+        "Updates the weights by the mean TD gradient of a minibatch of replayed transitions."
+        gradient = self.replayBuffer.tdGradient(self.replayBuffer.sample(self.batchSize), self.weightVector,
+                                                self.discount)
+        weights = self.weightVector
+        step = self.alpha / self.batchSize
+        for i, value in gradient.items():
+            weights[i] += step * value
 
     def final(self, state):
         "Called at the end of each game."
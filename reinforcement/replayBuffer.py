@@ -0,0 +1,85 @@
+# replayBuffer.py
+# ---------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+A ReplayBuffer keeps the transitions an ApproximateQAgent has seen, as
+features, so that it can learn from minibatches of old transitions instead
+of from each transition once as it happens:
+
+python pacman.py -p ApproximateQAgent -x 50 -n 60 -l mediumGrid -a extractor=SimpleExtractor,replay=10000,batchSize=32
+
+replay is the number of transitions kept, batchSize the number replayed in
+each update and replayEvery the number of steps between updates.
+"""
+
+from array import array
+import operator
+import random
+
+
+class ReplayBuffer:
+    """
+    A ring buffer of the last capacity transitions, overwritten oldest first.
+    Slot i holds the sparse (indices, values) features of a transition's
+    state and action, its reward, and the features of every legal action of
+    its next state, which is an empty list when the next state is terminal.
+    The slots are allocated up front.
+    """
+
+    def __init__(self, capacity, rng=random):
+        self.capacity = capacity
+        self.features = [None] * capacity
+        self.rewards = array('d', bytes(8 * capacity))
+        self.nextFeatures = [None] * capacity
+        self.size = 0
+        self.nextSlot = 0
+        self.rng = rng
+
+    def add(self, features, reward, nextFeatures):
+        "Stores a transition, overwriting the oldest one when the buffer is full."
+        slot = self.nextSlot
+        self.features[slot] = features
+        self.rewards[slot] = reward
+        self.nextFeatures[slot] = nextFeatures
+        self.nextSlot = (slot + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def __len__(self):
+        return self.size
+
+    def sample(self, k):
+        "k distinct slots, chosen uniformly from the stored transitions."
+        return self.rng.sample(range(self.size), k)
+
+    def tdGradient(self, slots, weights, discount):
+        """
+        The sum of the TD errors of the transitions in slots under weights
+        (an array indexed by feature) times their features, as a dict from
+        feature index to value.  Every error is computed from the same
+        weights, so applying the gradient is one update for the minibatch.
+        """
+        def qValue(sparse):
+            indices, values = sparse
+            return sum(map(operator.mul, map(weights.__getitem__, indices), values))
+        gradient = {}
+        for slot in slots:
+            nextFeatures = self.nextFeatures[slot]
+            target = self.rewards[slot]
+            if nextFeatures:
+                target += discount * max(map(qValue, nextFeatures))
+            error = target - qValue(self.features[slot])
+            indices, values = self.features[slot]
+            for i, value in zip(indices, values):
+                gradient[i] = gradient.get(i, 0.0) + error * value
+        return gradient
@@ -260,6 +260,104 @@ class PriorityQueueWithFunction(PriorityQueue):
         PriorityQueue.push(self, item, self.priorityFunction(item))
 
 
+class IndexedPriorityQueue:
+    """
+      A priority queue over distinct, hashable items that keeps a map from
+      each item to its slot in the heap.  This makes update (decrease-key)
+      and membership tests O(log n) and O(1) respectively, instead of the
+      linear scan done by PriorityQueue.update.
+
+      Ties are broken by insertion order, exactly as in PriorityQueue, so
+      replacing one with the other does not change the order of pops.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.index = {}
+        self.count = 0
+
+    def push(self, item, priority):
+        "Adds 'item' with 'priority', or resets its priority if already queued"
+        if item in self.index:
+            position = self.index[item]
+            (oldPriority, c, _) = self.heap[position]
+            self.heap[position] = (priority, c, item)
+            if priority < oldPriority:
+                self._siftUp(position)
+            else:
+                self._siftDown(position)
+            return
+        self.heap.append((priority, self.count, item))
+        self.index[item] = len(self.heap) - 1
+        self.count += 1
+        self._siftUp(len(self.heap) - 1)
+
+    def pop(self):
+        "Removes and returns the item with the lowest priority"
+        last = self.heap.pop()
+        if self.heap:
+            (_, _, item) = self.heap[0]
+            self.heap[0] = last
+            self.index[last[2]] = 0
+            self._siftDown(0)
+        else:
+            item = last[2]
+        del self.index[item]
+        return item
+
+    def peek(self):
+        "Returns the item with the lowest priority without removing it"
+        return self.heap[0][2]
+
+    def isEmpty(self):
+        return len(self.heap) == 0
+
+    def update(self, item, priority):
+        # If item already in priority queue with higher priority, decrease its priority in place.
+        # If item already in priority queue with equal or lower priority, do nothing.
+        # If item not in priority queue, do the same thing as self.push.
+        position = self.index.get(item)
+        if position is None:
+            self.push(item, priority)
+        elif priority < self.heap[position][0]:
+            self.heap[position] = (priority, self.heap[position][1], item)
+            self._siftUp(position)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, item):
+        return item in self.index
+
+    def _siftUp(self, position):
+        heap, index = self.heap, self.index
+        entry = heap[position]
+        while position > 0:
+            parent = (position - 1) >> 1
+            if heap[parent] <= entry: break
+            heap[position] = heap[parent]
+            index[heap[position][2]] = position
+            position = parent
+        heap[position] = entry
+        index[entry[2]] = position
+
+    def _siftDown(self, position):
+        heap, index = self.heap, self.index
+        size = len(heap)
+        entry = heap[position]
+        child = 2 * position + 1
+        while child < size:
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if entry <= heap[child]: break
+            heap[position] = heap[child]
+            index[heap[position][2]] = position
+            position = child
+            child = 2 * position + 1
+        heap[position] = entry
+        index[entry[2]] = position
+
+
 def manhattanDistance(xy1, xy2):
     "Returns the Manhattan distance between points xy1 and xy2"
     return abs(xy1[0] - xy2[0]) + abs(xy1[1] - xy2[1])
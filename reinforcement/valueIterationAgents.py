@@ -27,6 +27,7 @@
 
 
 import mdp, util, copy
+import compiledMdp
 
 from learningAgents import ValueEstimationAgent
 import collections
@@ -184,7 +185,7 @@ class PrioritizedSweepingValueIterationAgent(AsynchronousValueIterationAgent):
         "*** YOUR CODE HERE ***"
 
         predecessors = {}
-        queue = util.PriorityQueue()
+        queue = util.IndexedPriorityQueue()
         states = self.mdp.getStates()
 
         # Compute predecessors of all states
@@ -233,3 +234,99 @@ class PrioritizedSweepingValueIterationAgent(AsynchronousValueIterationAgent):
                     # If diff > theta, push p into the priority queue with priority -diff
                     if diff > self.theta:
                         queue.update(predecessor, -diff)
+
+
+class CompiledValueIterationAgent(ValueIterationAgent):
+    """
+        A CompiledValueIterationAgent runs the same value iteration as
+        ValueIterationAgent, with the same results, but compiles the mdp
+        into flat arrays once (see compiledMdp.py) instead of querying it for
+        every state in every iteration.
+
+        With a tolerance above 0, it stops as soon as no value changes by
+        more than the tolerance in an iteration.  self.iterationsRun holds
+        the number of iterations actually run.
+    """
+
+    def __init__(self, mdp, discount=0.9, iterations=100, tolerance=0.0):
+        self.tolerance = tolerance
+        ValueIterationAgent.__init__(self, mdp, discount, iterations)
+
+    def runValueIteration(self):
+        self.compiled = compiledMdp.getCompiledMDP(self.mdp)
+        values = [0] * self.compiled.numStates
+        self.iterationsRun = 0
+        for i in range(self.iterations):
+            newValues = self.compiled.bellmanBackup(values, self.discount)
+            self.iterationsRun += 1
+            converged = (self.tolerance > 0 and
+                         max(abs(new - old) for new, old in zip(newValues, values)) <= self.tolerance)
+            values = newValues
+            if converged: break
+        self.stateValues = values
+        self.values = util.Counter()
+        for state, value in zip(self.compiled.states, values):
+            self.values[state] = value
+
+    def computeQValueFromValues(self, state, action):
+        for row, rowAction in self.compiled.rowsOf(state):
+            if rowAction == action:
+                return self.compiled.qValue(row, self.stateValues, self.discount)
+        return 0
+
+
+class CompiledPrioritizedSweepingAgent(CompiledValueIterationAgent):
+    """
+        A CompiledPrioritizedSweepingAgent runs prioritized sweeping over a
+        compiledMdp.CompiledMDP.  States are integers, predecessors come
+        from the compiled reverse index and the queue is a
+        util.IndexedPriorityQueue.  The Q-value of every (state, action) row
+        is kept up to date: when a state's value changes by delta, each row
+        with a transition into it changes by prob * discount * delta, so a
+        predecessor's error is a max over its rows rather than a recomputation.
+
+        Each iteration pops and updates one state, as in
+        PrioritizedSweepingValueIterationAgent.  With converge=True the
+        iteration limit is ignored and sweeping goes on until no state's
+        Bellman error exceeds theta.  self.iterationsRun holds the number of
+        states updated.
+    """
+
+    def __init__(self, mdp, discount=0.9, iterations=100, theta=1e-5, converge=False):
+        self.theta = theta
+        self.converge = converge
+        CompiledValueIterationAgent.__init__(self, mdp, discount, iterations)
+
+    def runValueIteration(self):
+        compiled = self.compiled = compiledMdp.getCompiledMDP(self.mdp)
+        compiled.buildPredecessors()
+        discount, theta = self.discount, self.theta
+        values = [0] * compiled.numStates
+        qValues = compiled.qValues(values, discount)
+        rowStart, inStart, inRow, inProb = compiled.rowStart, compiled.inStart, compiled.inRow, compiled.inProb
+        predStart, predList = compiled.predStart, compiled.predList
+
+        queue = util.IndexedPriorityQueue()
+        for i, rows in compiled.stateSlices:
+            queue.update(i, -abs(values[i] - max(qValues[rows])))
+
+        self.iterationsRun = 0
+        while not queue.isEmpty() and (self.converge or self.iterationsRun < self.iterations):
+            current = queue.pop()
+            self.iterationsRun += 1
+            newValue = max(qValues[rowStart[current]:rowStart[current + 1]])
+            delta = discount * (newValue - values[current])
+            values[current] = newValue
+            for t in range(inStart[current], inStart[current + 1]):
+                qValues[inRow[t]] += inProb[t] * delta
+
+            for p in range(predStart[current], predStart[current + 1]):
+                predecessor = predList[p]
+                diff = abs(values[predecessor] - max(qValues[rowStart[predecessor]:rowStart[predecessor + 1]]))
+                if diff > theta:
+                    queue.update(predecessor, -diff)
+
+        self.stateValues = values
+        self.values = util.Counter()
+        for state, value in zip(compiled.states, values):
+            self.values[state] = value
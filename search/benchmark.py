@@ -0,0 +1,298 @@
+# benchmark.py
+# ------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Timing harness for the search project.
+
+Each case is run in a fresh interpreter so that the reported peak resident set
+size belongs to that case alone.  To compare against another implementation of
+the search functions, copy it next to this file and pass its module name:
+
+> python benchmark.py
+> python benchmark.py --module search_old --cases bigMaze-bfs,bigMaze-dfs
+
+The --queue option instead times util.PriorityQueue against
+util.IndexedPriorityQueue on a stream of decrease-key updates:
+
+> python benchmark.py --queue --items 1000 --updates 100000
+
+The --grids option compares game.Grid with game.BitGrid on FoodSearchProblem
+expansions over bigSearch and GameState.generateSuccessor over mediumClassic:
+
+> python benchmark.py --grids
+
+The --distances option times building mazeDistances.MazeDistances and looking
+up distances in it, against one breadth first search per query as the
+original searchAgents.mazeDistance did:
+
+> python benchmark.py --distances
+"""
+
+import collections
+import importlib
+import random
+import subprocess
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+import game
+import layout
+import mazeDistances
+import pacman
+import searchAgents
+import util
+
+
+def _gameState(layoutName):
+    lay = layout.getLayout(layoutName)
+    if lay == None: raise Exception("The layout " + layoutName + " cannot be found")
+    gameState = pacman.GameState()
+    gameState.initialize(lay, 0)
+    return gameState
+
+
+def _positionProblem(gameState):
+    return searchAgents.PositionSearchProblem(gameState, warn=False, visualize=False)
+
+
+def _runClosestDot(search, gameState):
+    "Repeated BFS to the closest dot, as ClosestDotSearchAgent does."
+    expanded, length = 0, 0
+    while gameState.getFood().count() > 0:
+        problem = searchAgents.AnyFoodSearchProblem(gameState)
+        actions = search.breadthFirstSearch(problem)
+        expanded += problem._expanded
+        length += len(actions)
+        for action in actions:
+            gameState = gameState.generateSuccessor(0, action)
+    return expanded, length
+
+
+def _runSingle(problemFn, searchName, heuristic=None):
+    def run(search, gameState):
+        problem = problemFn(gameState)
+        func = getattr(search, searchName)
+        if heuristic is None:
+            actions = func(problem)
+        else:
+            actions = func(problem, heuristic)
+        return problem._expanded, len(actions)
+    return run
+
+
+# name -> (layout, runner)
+CASES = [
+    ('bigMaze-dfs', 'bigMaze', _runSingle(_positionProblem, 'depthFirstSearch')),
+    ('bigMaze-bfs', 'bigMaze', _runSingle(_positionProblem, 'breadthFirstSearch')),
+    ('bigMaze-ucs', 'bigMaze', _runSingle(_positionProblem, 'uniformCostSearch')),
+    ('bigMaze-astar', 'bigMaze', _runSingle(_positionProblem, 'aStarSearch',
+                                            searchAgents.manhattanHeuristic)),
+    ('bigCorners-bfs', 'bigCorners', _runSingle(searchAgents.CornersProblem, 'breadthFirstSearch')),
+    ('bigCorners-astar', 'bigCorners', _runSingle(searchAgents.CornersProblem, 'aStarSearch',
+                                                  searchAgents.cornersHeuristic)),
+    ('bigSearch-closestDot', 'bigSearch', _runClosestDot),
+]
+
+
+def runCase(name, moduleName):
+    """
+    Runs a single case in this process and prints one tab separated line:
+    name, expanded nodes, path length, seconds, nodes/sec, peak RSS in KB.
+    """
+    search = importlib.import_module(moduleName)
+    searchAgents.search = search
+    for caseName, layoutName, runner in CASES:
+        if caseName == name: break
+    else:
+        raise Exception("Unknown benchmark case " + name)
+    gameState = _gameState(layoutName)
+    start = time.perf_counter()
+    expanded, length = runner(search, gameState)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else -1
+    print('%s\t%d\t%d\t%.4f\t%.0f\t%d' % (name, expanded, length, elapsed, expanded / max(elapsed, 1e-9), peak))
+
+
+def runQueueBenchmark(numItems, numUpdates, seed=0):
+    """
+    Pushes numItems items, applies numUpdates random decreases through update
+    and then drains the queue, for both priority queue classes.  The pop
+    orders must agree.
+    """
+    rng = random.Random(seed)
+    priorities = [rng.random() * numUpdates for _ in range(numItems)]
+    updates = []
+    for _ in range(numUpdates):
+        item = rng.randrange(numItems)
+        priorities[item] -= rng.random()
+        updates.append((item, priorities[item]))
+
+    print('%-22s %10s %10s %14s' % ('queue', 'updates', 'seconds', 'updates/sec'))
+    orders = []
+    for queueClass in [util.PriorityQueue, util.IndexedPriorityQueue]:
+        queue = queueClass()
+        for item in range(numItems):
+            queue.push(item, priorities[item] + numUpdates)
+        start = time.perf_counter()
+        for item, priority in updates:
+            queue.update(item, priority)
+        elapsed = time.perf_counter() - start
+        order = []
+        while not queue.isEmpty():
+            order.append(queue.pop())
+        orders.append(order)
+        print('%-22s %10d %10.4f %14.0f' % (queueClass.__name__, numUpdates, elapsed, numUpdates / max(elapsed, 1e-9)))
+    if orders[0] != orders[1]:
+        raise Exception('PriorityQueue and IndexedPriorityQueue popped in different orders')
+
+
+def _expandFoodStates(problem, limit):
+    "Breadth first expansion of up to limit states, hashing each one."
+    seen = set([problem.getStartState()])
+    frontier = collections.deque(seen)
+    expanded = 0
+    while frontier and expanded < limit:
+        state = frontier.popleft()
+        expanded += 1
+        for successor, action, stepCost in problem.getSuccessors(state):
+            if successor not in seen:
+                seen.add(successor)
+                frontier.append(successor)
+    return expanded
+
+
+def _playSuccessors(gameState, steps, seed):
+    """
+    Generates every successor along a random walk through the game, agent by
+    agent, restarting from the initial state whenever the game ends.
+    """
+    rng = random.Random(seed)
+    initialState = gameState
+    generated = 0
+    agentIndex = 0
+    for _ in range(steps):
+        if gameState.isWin() or gameState.isLose():
+            gameState, agentIndex = initialState, 0
+        successors = [gameState.generateSuccessor(agentIndex, action)
+                      for action in gameState.getLegalActions(agentIndex)]
+        generated += len(successors)
+        gameState = rng.choice(successors)
+        agentIndex = (agentIndex + 1) % gameState.getNumAgents()
+    return generated
+
+
+def runGridBenchmark(limit, steps):
+    print('%-36s %10s %10s %12s' % ('grids', 'work', 'seconds', 'per sec'))
+    for bitGrids in [False, True]:
+        gridName = bitGrids and 'BitGrid' or 'Grid'
+
+        problem = searchAgents.FoodSearchProblem(_gameState('bigSearch'))
+        food = problem.start[1]
+        problem.start = (problem.start[0], bitGrids and game.toBitGrid(food) or game.toGrid(food))
+        start = time.perf_counter()
+        expanded = _expandFoodStates(problem, limit)
+        elapsed = time.perf_counter() - start
+        print('%-36s %10d %10.4f %12.0f' % ('FoodSearchProblem bigSearch ' + gridName, expanded, elapsed, expanded / elapsed))
+
+        gameState = pacman.GameState()
+        gameState.initialize(layout.getLayout('mediumClassic', bitGrids=bitGrids), 2)
+        start = time.perf_counter()
+        generated = _playSuccessors(gameState, steps, 0)
+        elapsed = time.perf_counter() - start
+        pacman.GameState.getAndResetExplored()
+        print('%-36s %10d %10.4f %12.0f' % ('generateSuccessor mediumClassic ' + gridName, generated, elapsed, generated / elapsed))
+
+
+def runDistanceBenchmark(numQueries, numSearches, seed=0):
+    rng = random.Random(seed)
+    print('%-16s %8s %10s %16s %16s' % ('layout', 'cells', 'build(s)', 'lookup(us)', 'bfs query(us)'))
+    for layoutName in ['originalClassic', 'bigSearch']:
+        gameState = _gameState(layoutName)
+        walls = gameState.getWalls()
+        cells = walls.asList(False)
+        pairs = [(rng.choice(cells), rng.choice(cells)) for _ in range(numQueries)]
+
+        start = time.perf_counter()
+        distances = mazeDistances.MazeDistances(walls)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for pos1, pos2 in pairs:
+            distances.getDistance(pos1, pos2)
+        lookup = (time.perf_counter() - start) / numQueries
+
+        search = importlib.import_module('search')
+        start = time.perf_counter()
+        for pos1, pos2 in pairs[:numSearches]:
+            problem = searchAgents.PositionSearchProblem(gameState, start=pos1, goal=pos2, warn=False, visualize=False)
+            if len(search.bfs(problem)) != distances.getDistance(pos1, pos2):
+                raise Exception('MazeDistances disagrees with breadth first search')
+        bfsQuery = (time.perf_counter() - start) / numSearches
+
+        print('%-16s %8d %10.4f %16.3f %16.1f' % (layoutName, len(cells), build, lookup * 1e6, bfsQuery * 1e6))
+
+
+def readCommand(argv):
+    from optparse import OptionParser
+    parser = OptionParser(__doc__)
+    parser.add_option('-m', '--module', dest='module', default='search',
+                      help='module providing the search functions (default %default)')
+    parser.add_option('-c', '--cases', dest='cases', default=None,
+                      help='comma separated list of cases to run (default all)')
+    parser.add_option('--queue', action='store_true', dest='queue', default=False,
+                      help='run the priority queue micro-benchmark instead')
+    parser.add_option('--items', dest='items', type='int', default=1000,
+                      help='number of distinct items for --queue (default %default)')
+    parser.add_option('--updates', dest='updates', type='int', default=100000,
+                      help='number of update calls for --queue (default %default)')
+    parser.add_option('--grids', action='store_true', dest='grids', default=False,
+                      help='run the Grid vs BitGrid benchmark instead')
+    parser.add_option('--distances', action='store_true', dest='distances', default=False,
+                      help='run the maze distance benchmark instead')
+    parser.add_option('--case', dest='case', default=None,
+                      help='internal: run one case in this process')
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        raise Exception('Command line input not understood: ' + str(otherjunk))
+    return options
+
+
+if __name__ == '__main__':
+    options = readCommand(sys.argv[1:])
+    if options.queue:
+        runQueueBenchmark(options.items, options.updates)
+        sys.exit(0)
+    if options.grids:
+        runGridBenchmark(20000, 2000)
+        sys.exit(0)
+    if options.distances:
+        runDistanceBenchmark(100000, 500)
+        sys.exit(0)
+    if options.case:
+        runCase(options.case, options.module)
+        sys.exit(0)
+
+    names = [c[0] for c in CASES]
+    if options.cases: names = options.cases.split(',')
+    print('%-22s %10s %6s %10s %12s %12s' % ('case', 'expanded', 'cost', 'seconds', 'nodes/sec', 'peakRSS(KB)'))
+    for name in names:
+        out = subprocess.check_output([sys.executable, __file__, '--case', name, '--module', options.module],
+                                      universal_newlines=True)
+        name, expanded, length, elapsed, rate, peak = out.strip().split('\n')[-1].split('\t')
+        print('%-22s %10s %6s %10s %12s %12s' % (name, expanded, length, elapsed, rate, peak))
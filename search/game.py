@@ -190,6 +190,7 @@ class Grid:
 
     def __eq__(self, other):
         if other == None: return False
+        if isinstance(other, BitGrid): return other == self
         return self.data == other.data
 
     def __hash__(self):
@@ -274,6 +275,136 @@ class Grid:
                 bools.append(False)
         return bools
 
+class BitGrid:
+    """
+    A Grid whose cells are packed into the bits of a single Python int.
+
+    Cell (x, y) is bit x * height + y, which is the order used by Grid.__hash__,
+    so a BitGrid hashes like a Grid holding the same cells.  Because ints are
+    immutable, copy() is O(1); hashing is a single int hash, count() is a
+    popcount and asList() only visits the set bits.  Cells are still read and
+    written as grid[x][y], but only booleans can be stored.
+    """
+    def __init__(self, width, height, initialValue=False, bitRepresentation=None):
+        if initialValue not in [False, True]: raise Exception('Grids can only contain booleans')
+        self.width = width
+        self.height = height
+        self.bits = (1 << (width * height)) - 1 if initialValue else 0
+        if bitRepresentation:
+            self._unpackBits(bitRepresentation)
+
+    def __getitem__(self, i):
+        if i < 0: i += self.width
+        if not 0 <= i < self.width: raise IndexError('BitGrid column out of range')
+        return BitGridColumn(self, i)
+
+    def __setitem__(self, key, item):
+        column = self[key]
+        for y in range(self.height):
+            column[y] = item[y]
+
+    def __str__(self):
+        out = [[str(self[x][y])[0] for x in range(self.width)] for y in range(self.height)]
+        out.reverse()
+        return '\n'.join([''.join(x) for x in out])
+
+    def __eq__(self, other):
+        if other == None: return False
+        if not isinstance(other, BitGrid): other = toBitGrid(other)
+        return self.bits == other.bits and self.width == other.width and self.height == other.height
+
+    def __hash__(self):
+        return hash(self.bits)
+
+    def copy(self):
+        g = BitGrid(self.width, self.height)
+        g.bits = self.bits
+        return g
+
+    def deepCopy(self):
+        return self.copy()
+
+    def shallowCopy(self):
+        # Cells cannot be shared through an immutable int, so this is a copy.
+        return self.copy()
+
+    def count(self, item =True ):
+        ones = bin(self.bits).count('1')
+        if item: return ones
+        return self.width * self.height - ones
+
+    def asList(self, key = True):
+        bits = self.bits
+        if not key: bits ^= (1 << (self.width * self.height)) - 1
+        # Least significant bit first, so cells come out in the same order as Grid.asList
+        digits = bin(bits)[:1:-1]
+        list = []
+        i = digits.find('1')
+        while i >= 0:
+            list.append(divmod(i, self.height))
+            i = digits.find('1', i + 1)
+        return list
+
+    def packBits(self):
+        """
+        Returns an efficient int list representation
+
+        (width, height, bitPackedInts...)
+        """
+        return toGrid(self).packBits()
+
+    def _unpackBits(self, bits):
+        """
+        Fills in data from a bit-level representation
+        """
+        self.bits = toBitGrid(Grid(self.width, self.height, bitRepresentation=bits)).bits
+
+class BitGridColumn:
+    """
+    A view of one column of a BitGrid, so that grid[x][y] reads and writes
+    the underlying bits.
+    """
+    __slots__ = ('grid', 'offset', 'height')
+
+    def __init__(self, grid, x):
+        self.grid = grid
+        self.offset = x * grid.height
+        self.height = grid.height
+
+    def __getitem__(self, y):
+        if y < 0: y += self.height
+        if not 0 <= y < self.height: raise IndexError('BitGrid row out of range')
+        return (self.grid.bits >> (self.offset + y)) & 1 == 1
+
+    def __setitem__(self, y, value):
+        if y < 0: y += self.height
+        if not 0 <= y < self.height: raise IndexError('BitGrid row out of range')
+        if value:
+            self.grid.bits |= 1 << (self.offset + y)
+        else:
+            self.grid.bits &= ~(1 << (self.offset + y))
+
+    def __len__(self):
+        return self.height
+
+def toBitGrid(grid):
+    "Returns a BitGrid with the same cells as grid"
+    if isinstance(grid, BitGrid): return grid.copy()
+    g = BitGrid(grid.width, grid.height)
+    base = 1
+    for column in grid.data:
+        for cell in column:
+            if cell: g.bits |= base
+            base <<= 1
+    return g
+
+def toGrid(grid):
+    "Returns a list-of-lists Grid with the same cells as grid"
+    g = Grid(grid.width, grid.height)
+    for x, y in grid.asList():
+        g[x][y] = True
+    return g
+
 def reconstituteGrid(bitRep):
     if type(bitRep) is not type((1,2)):
         return bitRep
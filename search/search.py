@@ -74,6 +74,55 @@ def tinyMazeSearch(problem):
     return [s, s, w, s, w, w, s, w]
 
 
+def _reconstructPath(node):
+    """
+    Walks the parent pointers of a search node back to the root and returns
+    the list of actions that leads from the start state to the node's state.
+
+    A search node is a tuple (state, action, parent, cost), where the root
+    node has parent None.
+    """
+    actions = []
+    while node[2] is not None:
+        actions.append(node[1])
+        node = node[2]
+    actions.reverse()
+    return actions
+
+
+def _graphSearch(problem, frontier, priority=None):
+    """
+    Generic graph search shared by the strategies below.
+
+    Frontier entries are parent-pointer nodes rather than full action lists, so
+    every push costs O(1) memory and the path is only rebuilt once a goal is
+    popped. Expanded states are kept in a hashed closed set. If 'priority' is
+    given, it maps (state, cost) to the priority used with frontier.push.
+    """
+    def push(node):
+        if priority is None:
+            frontier.push(node)
+        else:
+            frontier.push(node, priority(node[0], node[3]))
+
+    closed = set()
+    push((problem.getStartState(), None, None, 0))
+
+    while not frontier.isEmpty():
+        node = frontier.pop()
+        current = node[0]
+
+        if problem.isGoalState(current):
+            return _reconstructPath(node)
+
+        if current not in closed:
+            closed.add(current)
+
+            for successor, action, stepCost in problem.getSuccessors(current):
+                if successor not in closed:
+                    push((successor, action, node, node[3] + stepCost))
+
+
 def depthFirstSearch(problem):
     """
     Search the deepest nodes in the search tree first.
@@ -89,78 +138,19 @@ def depthFirstSearch(problem):
     print("Start's successors:", problem.getSuccessors(problem.getStartState()))
     """
     "*** YOUR CODE HERE ***"
-
-    work_list = util.Stack()
-    start = (problem.getStartState(), [])
-    visited = []
-
-    work_list.push(start)
-
-    while not work_list.isEmpty():
-        (current, direction) = work_list.pop()
-        # print(current, direction)
-
-        if problem.isGoalState(current):
-            return direction
-
-        if current not in visited:
-            visited.append(current)
-
-            for successor in problem.getSuccessors(current):
-                new_direction = direction + [successor[1]]
-
-                work_list.push((successor[0], new_direction))
+    return _graphSearch(problem, util.Stack())
 
 
 def breadthFirstSearch(problem):
     """Search the shallowest nodes in the search tree first."""
     "*** YOUR CODE HERE ***"
-    work_list = util.Queue()
-    start = (problem.getStartState(), [])
-    visited = []
-
-    work_list.push(start)
-
-    while not work_list.isEmpty():
-        (current, direction) = work_list.pop()
-        # print(current, direction)
-
-        if problem.isGoalState(current):
-            return direction
-
-        if current not in visited:
-            visited.append(current)
-
-            for successor in problem.getSuccessors(current):
-                new_direction = direction + [successor[1]]
-
-                work_list.push((successor[0], new_direction))
+    return _graphSearch(problem, util.Queue())
 
 
 def uniformCostSearch(problem):
     """Search the node of least total cost first."""
     "*** YOUR CODE HERE ***"
-    work_list = util.PriorityQueue()
-    start = (problem.getStartState(), [], 0)
-    visited = []
-
-    work_list.update(start, 0)
-
-    while not work_list.isEmpty():
-        (current, direction, cost) = work_list.pop()
-        # print(current, direction)
-
-        if problem.isGoalState(current):
-            return direction
-
-        if current not in visited:
-            visited.append(current)
-
-            for successor in problem.getSuccessors(current):
-                new_direction = direction + [successor[1]]
-                new_cost = cost + successor[2]
-
-                work_list.update((successor[0], new_direction, new_cost), new_cost)
+    return _graphSearch(problem, util.PriorityQueue(), lambda state, cost: cost)
 
 
 def nullHeuristic(state, problem=None):
@@ -174,27 +164,8 @@ def nullHeuristic(state, problem=None):
 def aStarSearch(problem, heuristic=nullHeuristic):
     """Search the node that has the lowest combined cost and heuristic first."""
     "*** YOUR CODE HERE ***"
-    work_list = util.PriorityQueue()
-    start = (problem.getStartState(), [], 0)
-    visited = []
-
-    work_list.update(start, 0)
-
-    while not work_list.isEmpty():
-        (current, direction, cost) = work_list.pop()
-        # print(current, direction)
-
-        if problem.isGoalState(current):
-            return direction
-
-        if current not in visited:
-            visited.append(current)
-
-            for successor in problem.getSuccessors(current):
-                new_direction = direction + [successor[1]]
-                new_cost = cost + successor[2]
-
-                work_list.update((successor[0], new_direction, new_cost), new_cost + heuristic(successor[0], problem))
+    return _graphSearch(problem, util.PriorityQueue(),
+                        lambda state, cost: cost + heuristic(state, problem))
 
 
 # Abbreviations
@@ -37,9 +37,11 @@ Good luck and happy searching!
 from game import Directions
 from game import Agent
 from game import Actions
+from game import toBitGrid
 import util
 import time
 import search
+import mazeDistances
 
 
 class GoWestAgent(Agent):
@@ -403,10 +405,13 @@ class FoodSearchProblem:
     A search state in this problem is a tuple ( pacmanPosition, foodGrid ) where
       pacmanPosition: a tuple (x,y) of integers specifying Pacman's position
       foodGrid:       a Grid (see game.py) of either True or False, specifying remaining food
+
+    The food is kept as a BitGrid, so the copy made for every successor and the
+    hash taken by the search's closed set are both O(1).
     """
 
     def __init__(self, startingGameState):
-        self.start = (startingGameState.getPacmanPosition(), startingGameState.getFood())
+        self.start = (startingGameState.getPacmanPosition(), toBitGrid(startingGameState.getFood()))
         self.walls = startingGameState.getWalls()
         self.startingGameState = startingGameState
         self._expanded = 0  # DO NOT CHANGE
@@ -491,7 +496,10 @@ def foodHeuristic(state, problem):
     if not food_coordinates:
         return 0
 
-    return max(map(lambda food_coord: mazeDistance(food_coord, position, problem.startingGameState), food_coordinates))
+    if 'mazeDistances' not in problem.heuristicInfo:
+        problem.heuristicInfo['mazeDistances'] = mazeDistances.getMazeDistances(problem.walls)
+    distances = problem.heuristicInfo['mazeDistances']
+    return max(distances.getDistance(food_coord, position) for food_coord in food_coordinates)
 
     # return 0
 
@@ -570,9 +578,11 @@ class AnyFoodSearchProblem(PositionSearchProblem):
 
 def mazeDistance(point1, point2, gameState):
     """
-    Returns the maze distance between any two points, using the search functions
-    you have already built. The gameState can be any game state -- Pacman's
-    position in that state is ignored.
+    Returns the maze distance between any two points. The gameState can be any
+    game state -- Pacman's position in that state is ignored.
+
+    The distance is read from the all-pairs table in mazeDistances.py, which is
+    built once per walls grid by breadth first search.
 
     Example usage: mazeDistance( (2,4), (5,6), gameState)
 
@@ -583,5 +593,4 @@ def mazeDistance(point1, point2, gameState):
     walls = gameState.getWalls()
     assert not walls[x1][y1], 'point1 is a wall: ' + str(point1)
     assert not walls[x2][y2], 'point2 is a wall: ' + str(point2)
-    prob = PositionSearchProblem(gameState, start=point1, goal=point2, warn=False, visualize=False)
-    return len(search.bfs(prob))
+    return mazeDistances.getMazeDistances(walls).getDistance(point1, point2)
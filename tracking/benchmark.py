@@ -0,0 +1,621 @@
+# benchmark.py
+# ------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Timing harness for the tracking project.
+
+The layouts are those in layouts/, plus bigHunt tiled --enlarge times in
+each direction.  Every option tracks the ghosts along a game played by a
+random Pacman against random ghosts, with the ghosts hidden from the
+inference modules as BustersAgent hides them.
+
+The --exact option measures the latency of ExactInference.elapseTime per
+tick, with the cached sparse transition matrices and with the loop over
+getPositionDistribution they replaced, checking that the beliefs agree:
+
+> python benchmark.py --exact
+> python benchmark.py --exact --layouts oneHunt,bigHunt --ticks 500 --enlarge 3
+
+The --particles option measures ticks per second of ParticleFilter, with
+particle arrays and systematic resampling and with the lists of positions
+and one sample per particle they replaced, for each --numParticles, and
+the L1 distance of the final beliefs from ExactInference's:
+
+> python benchmark.py --particles
+> python benchmark.py --particles --numParticles 300,3000 --layouts bigHunt --enlarge 3
+
+The --joint option measures JointParticleFilter, with particles in a
+column per ghost and with the list of tuples they replaced, on each layout
+with each number of --ghosts placed at random.  The tuples start from the
+product of the legal positions, so they are only run where it is small:
+
+> python benchmark.py --joint
+> python benchmark.py --joint --layouts oneHunt --ghosts 4,6 --numParticles 5000
+
+The --sampling option measures draws from the sonar noise, a ghost's
+action distribution and ExactInference beliefs, with util.Sampler and
+DiscreteDistribution.sample(k) and with the linear scans they replaced,
+checking that both make the same draws from the same seed:
+
+> python benchmark.py --sampling
+> python benchmark.py --sampling --layouts oneHunt --draws 10000
+
+The --observe option measures the latency of observeUpdate per tick for
+ExactInference and ParticleFilter, with likelihoods gathered from the
+observation matrix by cached true distances and with a Manhattan distance
+and a Counter lookup per position, checking that the beliefs agree:
+
+> python benchmark.py --observe
+> python benchmark.py --observe --layouts bigHunt --numParticles 300
+
+The --game option plays whole games of GreedyBustersAgent tracking the
+ghosts with MarginalInference, with and without inference.moveSamplerCache
+in the joint particle filter, and reports the speedup, the cache's hit rate
+and whether the games were the same:
+
+> python benchmark.py --game
+> python benchmark.py --game --layouts oneHunt --ghost DispersingGhost
+"""
+
+import gc
+import itertools
+import os
+import random
+import sys
+import time
+
+import busters
+import bustersAgents
+import bustersGhostAgents
+import ghostAgents
+import inference
+import layout
+import textDisplay
+import util
+from util import manhattanDistance
+from ghostAgents import RandomGhost
+
+
+def makeEnlargedLayout(layoutName, factor):
+    """
+    The layout tiled factor times across and factor times down, with the
+    agents of the first tile only.
+    """
+    text = layout.getLayout(layoutName).layoutText
+    blank = [row.replace('P', ' ').replace('G', ' ') for row in text]
+    rows = []
+    for tileRow in range(factor):
+        for i in range(len(text)):
+            rows.append(''.join((tileRow == 0 and tile == 0 and text or blank)[i] for tile in range(factor)))
+    return layout.Layout(rows)
+
+
+def makeHuntLayout(layoutName, numGhosts, seed=0):
+    """
+    The layout with numGhosts ghosts in place of its own, at random open
+    squares, and a jail square in the bottom row for each.
+    """
+    text = [list(row.replace('G', ' ')) for row in layout.getLayout(layoutName).layoutText]
+    # The jail of ghost i is (2i - 1, 1), and y = 1 is the second row from the bottom
+    for i in range(1, numGhosts + 1):
+        text[-2][2 * i - 1] = ' '
+    squares = [(row, x) for row in range(len(text) - 3) for x in range(len(text[row])) if text[row][x] == ' ']
+    for row, x in random.Random(seed).sample(squares, numGhosts):
+        text[row][x] = 'G'
+    return layout.Layout([''.join(row) for row in text])
+
+
+def _layouts(layoutNames, enlarge):
+    "(name, layout) pairs for the named layouts and the enlarged bigHunt."
+    layouts = [(name, layout.getLayout(name)) for name in layoutNames]
+    if enlarge > 1:
+        layouts.append(('bigHunt x%d' % enlarge, makeEnlargedLayout('bigHunt', enlarge)))
+    return layouts
+
+
+def _trackingStates(lay, numTicks, seed):
+    """
+    The states Pacman observes along a game of a random Pacman against
+    random ghosts, with the ghost states hidden.
+    """
+    rng = random.Random(seed)
+    random.seed(seed)
+    state = busters.GameState()
+    state.initialize(lay, lay.getNumGhosts())
+    states = []
+    while len(states) < numTicks and not (state.isWin() or state.isLose()):
+        observed = state.deepCopy()
+        agents = observed.data.agentStates
+        observed.data.agentStates = [agents[0]] + [None for i in range(1, len(agents))]
+        states.append(observed)
+        for agentIndex in range(state.getNumAgents()):
+            if state.isWin() or state.isLose(): break
+            state = state.getResult(agentIndex, rng.choice(state.getLegalActions(agentIndex)))
+    return states
+
+
+def _latencies(latencies):
+    "Mean, median, 95th percentile and maximum of a list of latencies."
+    latencies = sorted(latencies)
+    return (sum(latencies) / len(latencies), latencies[len(latencies) // 2],
+            latencies[int(0.95 * len(latencies))], latencies[-1])
+
+
+class _LoopExactInference(inference.ExactInference):
+    "ExactInference.elapseTime as it was before transition matrices, as a baseline."
+    def elapseTime(self, gameState):
+        newBeliefs = inference.DiscreteDistribution()
+        for oldPos in self.allPositions:
+            newPosDist = self.getPositionDistribution(gameState, oldPos)
+            for newPos in newPosDist:
+                newBeliefs[newPos] += self.beliefs[oldPos] * newPosDist[newPos]
+        newBeliefs.normalize()
+        self.beliefs = newBeliefs
+
+
+class _ListParticleFilter(inference.ParticleFilter):
+    """
+    ParticleFilter as it was before particle arrays: a list of positions,
+    resampled one DiscreteDistribution.sample at a time and moved one
+    getPositionDistribution at a time, as a baseline.
+    """
+    def initializeUniformly(self, gameState):
+        self.particles = [self.legalPositions[i % len(self.legalPositions)] for i in range(self.numParticles)]
+
+    def observeUpdate(self, observation, gameState):
+        belief = inference.DiscreteDistribution()
+        pacmanPosition = gameState.getPacmanPosition()
+        jailPosition = self.getJailPosition()
+        for p in self.particles:
+            belief[p] += self.getObservationProb(observation, pacmanPosition, p, jailPosition)
+        if belief.total() == 0:
+            self.initializeUniformly(gameState)
+        else:
+            belief.normalize()
+            self.particles = [belief.sample() for i in range(self.numParticles)]
+
+    def elapseTime(self, gameState):
+        self.particles = [self.getPositionDistribution(gameState, particle).sample() for particle in self.particles]
+
+    def getBeliefDistribution(self):
+        belief = inference.DiscreteDistribution()
+        for particle in self.particles:
+            belief[particle] += 1
+        belief.normalize()
+        return belief
+
+
+class _TupleJointParticleFilter(inference.JointParticleFilter):
+    """
+    JointParticleFilter as it was before particle columns: a list of tuples
+    of positions, starting from every tuple in the product of the legal
+    positions, as a baseline.
+    """
+    def initializeUniformly(self, gameState):
+        self.particles = list(itertools.product(self.legalPositions, repeat=self.numGhosts))
+        random.shuffle(self.particles)
+
+    def observeUpdate(self, observation, gameState):
+        belief = inference.DiscreteDistribution()
+        pacmanPosition = gameState.getPacmanPosition()
+        for p in self.particles:
+            prob = 1
+            for i in range(self.numGhosts):
+                prob *= self.getObservationProb(observation[i], pacmanPosition, p[i], self.getJailPosition(i))
+            belief[p] += prob
+        if belief.total() == 0:
+            self.initializeUniformly(gameState)
+        else:
+            belief.normalize()
+            self.particles = [belief.sample() for i in range(self.numParticles)]
+
+    def elapseTime(self, gameState):
+        self.particles = [tuple(self.getPositionDistribution(gameState, oldParticle, i, self.ghostAgents[i]).sample()
+                                for i in range(self.numGhosts)) for oldParticle in self.particles]
+
+    def getBeliefDistribution(self):
+        belief = inference.DiscreteDistribution()
+        for particle in self.particles:
+            belief[particle] += 1
+        belief.normalize()
+        return belief
+
+    def getMarginalDistribution(self, i):
+        dist = inference.DiscreteDistribution()
+        for t, prob in self.getBeliefDistribution().items():
+            dist[t[i]] += prob
+        return dist
+
+
+_counterObservationDistributions = {}
+def _counterObservationProbability(noisyDistance, trueDistance):
+    "busters.getObservationProbability as it was before the observation matrix, as a baseline."
+    if noisyDistance not in _counterObservationDistributions:
+        distribution = util.Counter()
+        for error, prob in zip(busters.SONAR_NOISE_VALUES, busters.SONAR_NOISE_PROBS):
+            distribution[max(1, noisyDistance - error)] += prob
+        _counterObservationDistributions[noisyDistance] = distribution
+    return _counterObservationDistributions[noisyDistance][trueDistance]
+
+
+class _ScanObservationProb:
+    """
+    getObservationProb and getObservationLikelihoods as they were before the
+    observation matrix and the distance cache, as a baseline: a Manhattan
+    distance and a Counter lookup per position.
+    """
+    def getObservationProb(self, noisyDistance, pacmanPosition, ghostPosition, jailPosition):
+        if ghostPosition == jailPosition:
+            return noisyDistance is None and 1 or 0
+        if noisyDistance is None:
+            return 0
+        return _counterObservationProbability(noisyDistance, manhattanDistance(pacmanPosition, ghostPosition))
+
+    def getObservationLikelihoods(self, noisyDistance, pacmanPosition, jailPosition):
+        key = (noisyDistance, pacmanPosition, jailPosition)
+        likelihoods = self.likelihoodCache.get(key)
+        if likelihoods is None:
+            likelihoods = [self.getObservationProb(noisyDistance, pacmanPosition, pos, jailPosition)
+                           for pos in self.allPositions]
+            self.likelihoodCache[key] = likelihoods
+        return likelihoods
+
+
+class _ScanExactInference(_ScanObservationProb, inference.ExactInference):
+    "ExactInference.observeUpdate as it was before the observation matrix, as a baseline."
+    def observeUpdate(self, observation, gameState):
+        pacmanPosition = gameState.getPacmanPosition()
+        jailPosition = self.getJailPosition()
+        for ghostPosition in self.allPositions:
+            self.beliefs[ghostPosition] *= self.getObservationProb(observation, pacmanPosition,
+                                                                   ghostPosition, jailPosition)
+        self.beliefs.normalize()
+
+
+class _ScanParticleFilter(_ScanObservationProb, inference.ParticleFilter):
+    "ParticleFilter with the likelihoods as they were before the observation matrix, as a baseline."
+
+
+class _UncachedJointParticleFilter(inference.JointParticleFilter):
+    "JointParticleFilter building a Sampler for every move, without moveSamplerCache, as a baseline."
+    def getMoveSampler(self, gameState, positions, i):
+        dist = self.getPositionDistribution(gameState, positions, i, self.ghostAgents[i])
+        return util.Sampler(list(dist.values()), [self.positionIds[pos] for pos in dist])
+
+
+def _distance(dist, other):
+    "The L1 distance between two distributions."
+    return sum(abs(dist[key] - other[key]) for key in set(dist) | set(other))
+
+
+def _track(module, states, timed):
+    """
+    Runs module along states as BustersAgent does, with the ghost's sonar
+    readings, and returns the microseconds each call of timed took, or each
+    elapseTime and observe together for 'tick', and the final beliefs.
+    """
+    module.initialize(states[0])
+    latencies = []
+    gc.collect()
+    gc.disable()
+    try:
+        for tick, state in enumerate(states):
+            start = time.perf_counter()
+            if tick > 0:
+                module.elapseTime(state)
+            middle = time.perf_counter()
+            module.observe(state)
+            end = time.perf_counter()
+            latencies.append(1e6 * {'elapseTime': middle - start, 'observe': end - middle, 'tick': end - start}[timed])
+    finally:
+        gc.enable()
+    return latencies[1:], module.getBeliefDistribution()
+
+
+def runExactBenchmark(layouts, numTicks, seed=0):
+    print('ExactInference.elapseTime, %d ticks per layout, latency per tick in microseconds' % numTicks)
+    print('%-14s %10s %-8s %10s %10s %10s %10s %10s %8s' % ('layout', 'positions', 'update', 'mean', 'median',
+                                                           '95th', 'max', 'matrices', 'same'))
+    for name, lay in layouts:
+        states = _trackingStates(lay, numTicks, seed)
+        beliefs = {}
+        for update, moduleClass in [('loop', _LoopExactInference), ('matrix', inference.ExactInference)]:
+            module = moduleClass(RandomGhost(1))
+            latencies, beliefs[update] = _track(module, states, 'elapseTime')
+            matrices = update == 'matrix' and str(len(module.transitionCache)) or '-'
+            same = update == 'matrix' and str(beliefs['loop'] == beliefs['matrix']) or '-'
+            print('%-14s %10d %-8s %10.1f %10.1f %10.1f %10.1f %10s %8s' % ((name, len(module.allPositions), update) +
+                                                                          _latencies(latencies) + (matrices, same)))
+
+
+def runParticleBenchmark(layouts, numTicks, particleCounts, seed=0):
+    print('ParticleFilter, %d ticks per layout, elapseTime and observe per tick' % numTicks)
+    print('%-14s %10s %10s %-8s %12s %12s %10s' % ('layout', 'positions', 'particles', 'filter', 'ticks/sec',
+                                                 'median us', 'L1 exact'))
+    for name, lay in layouts:
+        states = _trackingStates(lay, numTicks, seed)
+        latencies, exact = _track(inference.ExactInference(RandomGhost(1)), states, 'tick')
+        for numParticles in particleCounts:
+            for filterName, filterClass in [('list', _ListParticleFilter), ('array', inference.ParticleFilter)]:
+                random.seed(seed)
+                module = filterClass(RandomGhost(1), numParticles)
+                latencies, beliefs = _track(module, states, 'tick')
+                print('%-14s %10d %10d %-8s %12.1f %12.1f %10.3f' % (name, len(module.allPositions), numParticles,
+                                                                   filterName, 1e6 * len(latencies) / sum(latencies),
+                                                                   _latencies(latencies)[1],
+                                                                   _distance(beliefs, exact)))
+
+
+def _trackJoint(module, states):
+    """
+    Runs a JointParticleFilter along states as MarginalInference does,
+    reading every ghost's marginal each tick, and returns the milliseconds
+    initializing it took and the milliseconds of each tick.
+    """
+    numGhosts = states[0].getNumAgents() - 1
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        module.initialize(states[0], [p for p in states[0].getWalls().asList(False) if p[1] > 1])
+        for i in range(1, numGhosts + 1):
+            module.addGhostAgent(RandomGhost(i))
+        initialization = 1e3 * (time.perf_counter() - start)
+        latencies = []
+        for tick, state in enumerate(states):
+            start = time.perf_counter()
+            if tick > 0:
+                module.elapseTime(state)
+            module.observe(state)
+            for i in range(numGhosts):
+                module.getMarginalDistribution(i)
+            latencies.append(1e3 * (time.perf_counter() - start))
+    finally:
+        gc.enable()
+    return initialization, latencies
+
+
+def runJointBenchmark(layoutNames, ghostCounts, numTicks, numParticles, productLimit=10 ** 6, seed=0):
+    print('JointParticleFilter with %d particles, %d ticks per layout, milliseconds' % (numParticles, numTicks))
+    print('%-10s %7s %10s %-8s %10s %10s %10s %10s' % ('layout', 'ghosts', 'positions', 'filter', 'initialize',
+                                                     'mean tick', 'median', 'max'))
+    for layoutName in layoutNames:
+        for numGhosts in ghostCounts:
+            lay = makeHuntLayout(layoutName, numGhosts, seed)
+            states = _trackingStates(lay, numTicks, seed)
+            numLegal = len([p for p in states[0].getWalls().asList(False) if p[1] > 1])
+            for filterName, filterClass in [('tuples', _TupleJointParticleFilter),
+                                            ('columns', inference.JointParticleFilter)]:
+                if filterClass is _TupleJointParticleFilter and numLegal ** numGhosts > productLimit:
+                    print('%-10s %7d %10d %-8s %10s  %d^%d prior particles' % (layoutName, numGhosts, numLegal,
+                                                                              filterName, '-', numLegal, numGhosts))
+                    continue
+                random.seed(seed)
+                initialization, latencies = _trackJoint(filterClass(numParticles), states)
+                mean, median, p95, worst = _latencies(latencies)
+                print('%-10s %7d %10d %-8s %10.1f %10.1f %10.1f %10.1f' % (layoutName, numGhosts, numLegal, filterName,
+                                                                         initialization, mean, median, worst))
+
+
+def _scanSample(dist):
+    "DiscreteDistribution.sample as it was before util.Sampler, as a baseline."
+    rand = random.random() * dist.total()
+    index = 0
+    for key in dist.keys():
+        index += dist[key]
+        if index >= rand:
+            return key
+
+
+def _scanUtilSample(distribution, values=None):
+    "util.sample as it was before util.Sampler, as a baseline."
+    if type(distribution) == util.Counter:
+        items = sorted(distribution.items())
+        distribution = [i[1] for i in items]
+        values = [i[0] for i in items]
+    if sum(distribution) != 1:
+        distribution = util.normalize(distribution)
+    choice = random.random()
+    i, total = 0, distribution[0]
+    while choice > total:
+        i += 1
+        total += distribution[i]
+    return values[i]
+
+
+def _draws(draw, numDraws, seed):
+    "The draws numDraws calls of draw make from seed, and the microseconds per draw."
+    random.seed(seed)
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        draws = [draw() for i in range(numDraws)]
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.enable()
+    return draws, 1e6 * elapsed / numDraws
+
+
+def runSamplingBenchmark(layoutName, numDraws, seed=0):
+    lay = layout.getLayout(layoutName)
+    states = _trackingStates(lay, 2, seed)
+    module = inference.ExactInference(RandomGhost(1))
+    module.initialize(states[0])
+    module.observe(states[1])
+    beliefs = module.getBeliefDistribution()
+    state = busters.GameState()
+    state.initialize(lay, lay.getNumGhosts())
+    ghostActions = RandomGhost(1).getDistribution(state)
+    noise = util.Sampler(busters.SONAR_NOISE_PROBS, busters.SONAR_NOISE_VALUES)
+    cases = [
+        ('sonar noise', len(busters.SONAR_NOISE_VALUES),
+         lambda: _scanUtilSample(busters.SONAR_NOISE_PROBS, busters.SONAR_NOISE_VALUES), noise.sample, None),
+        ('ghost action', len(ghostActions), lambda: _scanUtilSample(ghostActions),
+         lambda: util.sample(ghostActions), None),
+        ('beliefs', len(beliefs), lambda: _scanSample(beliefs), beliefs.sample, beliefs.sample),
+    ]
+    print('%d draws from each distribution, beliefs after one observation on %s, microseconds per draw'
+          % (numDraws, layoutName))
+    print('%-14s %8s %10s %10s %10s %8s' % ('distribution', 'values', 'scan', 'sampler', 'sample(k)', 'same'))
+    for name, numValues, scan, sampler, batch in cases:
+        scanDraws, scanTime = _draws(scan, numDraws, seed)
+        samplerDraws, samplerTime = _draws(sampler, numDraws, seed)
+        batchTime = '-'
+        if batch is not None:
+            batchDraws, elapsed = _draws(lambda: batch(numDraws), 1, seed)
+            batchTime = '%10.2f' % (elapsed / numDraws)
+        print('%-14s %8d %10.2f %10.2f %10s %8s' % (name, numValues, scanTime, samplerTime, batchTime,
+                                                    scanDraws == samplerDraws))
+
+
+def runObserveBenchmark(layouts, numTicks, numParticles, seed=0):
+    print('observeUpdate, %d ticks per layout, %d particles, latency per tick in microseconds'
+          % (numTicks, numParticles))
+    print('%-14s %10s %-16s %-7s %10s %10s %10s %10s %8s' % ('layout', 'positions', 'module', 'update', 'mean',
+                                                          'median', '95th', 'max', 'same'))
+    for name, lay in layouts:
+        states = _trackingStates(lay, numTicks, seed)
+        for moduleName, scanClass, moduleClass in [('ExactInference', _ScanExactInference, inference.ExactInference),
+                                                   ('ParticleFilter', _ScanParticleFilter, inference.ParticleFilter)]:
+            beliefs = {}
+            for update, cls in [('scan', scanClass), ('matrix', moduleClass)]:
+                random.seed(seed)
+                module = cls(RandomGhost(1))
+                if moduleName == 'ParticleFilter':
+                    module.setNumParticles(numParticles)
+                latencies, beliefs[update] = _track(module, states, 'observe')
+                same = update == 'matrix' and str(beliefs['scan'] == beliefs['matrix']) or '-'
+                print('%-14s %10d %-16s %-7s %10.1f %10.1f %10.1f %10.1f %8s'
+                      % ((name, len(module.allPositions), moduleName, update) + _latencies(latencies) + (same,)))
+
+
+def _playGames(lay, inferenceClass, jointClass, ghostClass, numGames, seed):
+    """
+    Plays numGames games of a GreedyBustersAgent tracking the ghosts with
+    inferenceClass, as busters.py -p GreedyBustersAgent -q does, and
+    returns the seconds they took, the moves and the scores.
+    """
+    import __main__
+    __main__._display = textDisplay.NullGraphics()
+    random.seed(seed)
+    rules = busters.BustersGameRules()
+    ghosts = [ghostClass(i + 1) for i in range(lay.getNumGhosts())]
+    moves, scores = 0, []
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    start = time.perf_counter()
+    try:
+        for i in range(numGames):
+            inference.jointInference = jointClass()
+            pacman = bustersAgents.GreedyBustersAgent(ghostAgents=ghosts)
+            pacman.inferenceModules = [inferenceClass(ghost) for ghost in ghosts]
+            game = rules.newGame(lay, pacman, ghosts, __main__._display)
+            game.run()
+            moves += len(game.moveHistory)
+            scores.append(game.state.getScore())
+    finally:
+        sys.stdout = stdout
+    return time.perf_counter() - start, moves, scores
+
+
+def runGameBenchmark(layoutNames, ghostName, numGames, seed=0):
+    ghostClass = getattr(ghostAgents, ghostName, None) or getattr(bustersGhostAgents, ghostName)
+    print('%d games of GreedyBustersAgent with MarginalInference against %s per row, seconds'
+          % (numGames, ghostName))
+    print('%-10s %8s %10s %10s %9s %10s %10s %8s' % ('layout', 'moves', 'uncached', 'cached', 'speedup',
+                                                  'hit rate', 'entries', 'same'))
+    for layoutName in layoutNames:
+        lay = layout.getLayout(layoutName)
+        inference.moveSamplerCache.clear()
+        before, moves, scores = _playGames(lay, inference.MarginalInference, _UncachedJointParticleFilter,
+                                           ghostClass, numGames, seed)
+        inference.moveSamplerCache.clear()
+        after, cachedMoves, cachedScores = _playGames(lay, inference.MarginalInference,
+                                                      inference.JointParticleFilter, ghostClass, numGames, seed)
+        cache = inference.moveSamplerCache
+        print('%-10s %8d %10.2f %10.2f %8.1fx %10.3f %10d %8s' % (layoutName, moves, before, after, before / after,
+                                                              cache.hitRate(), len(cache), scores == cachedScores))
+
+
+def readCommand(argv):
+    from optparse import OptionParser
+    parser = OptionParser(__doc__)
+    parser.add_option('--exact', action='store_true', dest='exact', default=False,
+                      help='run the exact inference benchmark')
+    parser.add_option('--particles', action='store_true', dest='particles', default=False,
+                      help='run the particle filter benchmark')
+    parser.add_option('--joint', action='store_true', dest='joint', default=False,
+                      help='run the joint particle filter benchmark')
+    parser.add_option('--sampling', action='store_true', dest='sampling', default=False,
+                      help='run the sampling benchmark')
+    parser.add_option('--observe', action='store_true', dest='observe', default=False,
+                      help='run the observation update benchmark')
+    parser.add_option('--game', action='store_true', dest='game', default=False,
+                      help='run the move sampler cache benchmark over whole games')
+    parser.add_option('-l', '--layouts', dest='layouts', default=None,
+                      help='comma separated list of layouts (default smallHunt,oneHunt,openHunt,bigHunt '
+                           'for --exact and --observe, '
+                           'smallHunt,bigHunt for --particles, smallHunt,oneHunt for --joint, '
+                           'bigHunt for --sampling, or smallHunt,oneHunt for --game)')
+    parser.add_option('--enlarge', dest='enlarge', type='int', default=None,
+                      help='times to tile bigHunt in each direction for the enlarged layout, '
+                           'or 1 for none (default 3, or 1 for --particles)')
+    parser.add_option('--ticks', dest='ticks', type='int', default=None,
+                      help='ticks of each game (default 300, or 30 for --particles and --joint)')
+    parser.add_option('--numParticles', dest='numParticles', default=None,
+                      help='comma separated numbers of particles for --particles (default 300,3000,30000), '
+                           'or the number for --joint (default 600) and --observe (default 3000)')
+    parser.add_option('--draws', dest='draws', type='int', default=100000,
+                      help='draws from each distribution for --sampling (default %default)')
+    parser.add_option('--ghost', dest='ghost', default='RandomGhost',
+                      help='ghost agent for --game, from ghostAgents or bustersGhostAgents (default %default)')
+    parser.add_option('--games', dest='games', type='int', default=3,
+                      help='games per row for --game (default %default)')
+    parser.add_option('--ghosts', dest='ghosts', default='1,2,3,4,5,6',
+                      help='comma separated numbers of ghosts for --joint (default %default)')
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        raise Exception('Command line input not understood: ' + str(otherjunk))
+    return options
+
+
+if __name__ == '__main__':
+    options = readCommand(sys.argv[1:])
+    if options.exact:
+        layouts = _layouts((options.layouts or 'smallHunt,oneHunt,openHunt,bigHunt').split(','), options.enlarge or 3)
+        runExactBenchmark(layouts, options.ticks or 300)
+        sys.exit(0)
+    if options.particles:
+        layouts = _layouts((options.layouts or 'smallHunt,bigHunt').split(','), options.enlarge or 1)
+        runParticleBenchmark(layouts, options.ticks or 30,
+                             [int(n) for n in (options.numParticles or '300,3000,30000').split(',')])
+        sys.exit(0)
+    if options.joint:
+        runJointBenchmark((options.layouts or 'smallHunt,oneHunt').split(','),
+                          [int(n) for n in options.ghosts.split(',')], options.ticks or 30,
+                          int(options.numParticles or 600))
+        sys.exit(0)
+    if options.observe:
+        layouts = _layouts((options.layouts or 'smallHunt,oneHunt,openHunt,bigHunt').split(','), options.enlarge or 3)
+        runObserveBenchmark(layouts, options.ticks or 300, int(options.numParticles or 3000))
+        sys.exit(0)
+    if options.game:
+        runGameBenchmark((options.layouts or 'smallHunt,oneHunt').split(','), options.ghost, options.games)
+        sys.exit(0)
+    if options.sampling:
+        for layoutName in (options.layouts or 'bigHunt').split(','):
+            runSamplingBenchmark(layoutName, options.draws)
+        sys.exit(0)
+    print(__doc__)
@@ -38,24 +38,51 @@ SONAR_MAX = (SONAR_NOISE_RANGE - 1)/2
 SONAR_NOISE_VALUES = [i - SONAR_MAX for i in range(SONAR_NOISE_RANGE)]
 SONAR_DENOMINATOR = 2 ** SONAR_MAX  + 2 ** (SONAR_MAX + 1) - 2.0
 SONAR_NOISE_PROBS = [2 ** (SONAR_MAX-abs(v)) / SONAR_DENOMINATOR  for v in SONAR_NOISE_VALUES]
+SONAR_NOISE_SAMPLER = util.Sampler(SONAR_NOISE_PROBS, SONAR_NOISE_VALUES)
 
 def getNoisyDistance(pos1, pos2):
     if pos2[1] == 1: return None
     distance = util.manhattanDistance(pos1, pos2)
-    return max(0, distance + util.sample(SONAR_NOISE_PROBS, SONAR_NOISE_VALUES))
+    return max(0, distance + SONAR_NOISE_SAMPLER.sample())
+
+observationMatrix = []
+def getObservationRow(noisyDistance, width):
+    """
+    Returns a list of P( noisyDistance | trueDistance ) for every trueDistance
+    up to width at least, a row of a dense matrix computed from the sonar
+    noise.  The matrix is recomputed larger when a row or column beyond it
+    is asked for.  The sonar noise values are floats, so distances may be,
+    but noisyDistance must be a whole number.
+    """
+    global observationMatrix
+    noisyDistance = int(noisyDistance)
+    if noisyDistance >= len(observationMatrix) or width > len(observationMatrix[0]):
+        numRows = max(noisyDistance + 1, len(observationMatrix))
+        numColumns = max(width, observationMatrix and len(observationMatrix[0]) or 0)
+        matrix = [[0] * numColumns for noisy in range(numRows)]
+        for noisy, row in enumerate(matrix):
+            for error, prob in zip(SONAR_NOISE_VALUES, SONAR_NOISE_PROBS):
+                trueDistance = int(max(1, noisy - error))
+                if trueDistance < numColumns:
+                    row[trueDistance] += prob
+        observationMatrix = matrix
+    return observationMatrix[noisyDistance]
 
-observationDistributions = {}
 def getObservationProbability(noisyDistance, trueDistance):
     """
     Returns the probability P( noisyDistance | trueDistance ).
     """
-    global observationDistributions
-    if noisyDistance not in observationDistributions:
-        distribution = util.Counter()
-        for error , prob in zip(SONAR_NOISE_VALUES, SONAR_NOISE_PROBS):
-            distribution[max(1, noisyDistance - error)] += prob
-        observationDistributions[noisyDistance] = distribution
-    return observationDistributions[noisyDistance][trueDistance]
+    if noisyDistance >= 0 and trueDistance >= 0 and \
+            noisyDistance == int(noisyDistance) and trueDistance == int(trueDistance):
+        trueDistance = int(trueDistance)
+        return getObservationRow(noisyDistance, trueDistance + 1)[trueDistance]
+    # Distances off the matrix, such as fractional ones, are matched against
+    # the noise directly, which gives 0 unless some noise value fits exactly
+    prob = 0.0
+    for error, errorProb in zip(SONAR_NOISE_VALUES, SONAR_NOISE_PROBS):
+        if max(1, noisyDistance - error) == trueDistance:
+            prob += errorProb
+    return prob
 
 ###################################################
 # YOUR INTERFACE TO THE PACMAN WORLD: A GameState #
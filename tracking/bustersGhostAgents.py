@@ -26,6 +26,8 @@ class StationaryGhost( ghostAgents.GhostAgent ):
 
 class DispersingGhost( ghostAgents.GhostAgent ):
     "Chooses an action that distances the ghost from the other ghosts with probability spreadProb."
+    watchesOtherGhosts = True
+
     def __init__( self, index, spreadProb=0.5):
         self.index = index
         self.spreadProb = spreadProb
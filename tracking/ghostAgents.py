@@ -20,6 +20,10 @@ from util import manhattanDistance
 import util
 
 class GhostAgent( Agent ):
+    # Whether getDistribution looks at the positions of the other ghosts, which
+    # the inference modules then include when caching its move distributions
+    watchesOtherGhosts = False
+
     def __init__( self, index ):
         self.index = index
 
@@ -12,12 +12,20 @@
 # Pieter Abbeel (pabbeel@cs.berkeley.edu).
 
 
+from array import array
+import collections
 import itertools
+import math
+import operator
 import random
 import busters
 import game
+import util
 
-from util import manhattanDistance, raiseNotDefined
+from util import manhattanDistance, raiseNotDefined, Sampler
+
+# Samplers of ghost moves, shared by the joint particle filters
+moveSamplerCache = util.LRUCache(2 ** 16)
 
 
 class DiscreteDistribution(dict):
@@ -80,13 +88,13 @@ class DiscreteDistribution(dict):
         if total == 0.0:
             return
         else:
-            for key in self.keys():
-                self[key] = float(self[key]) / total
+            self.update([(key, float(value) / total) for key, value in self.items()])
 
-    def sample(self):
+    def sample(self, k=None):
         """
         Draw a random sample from the distribution and return the key, weighted
-        by the values associated with each key.
+        by the values associated with each key.  Given k, return a list of k
+        independent samples, which shares one table of cumulative weights.
 
         >>> dist = DiscreteDistribution()
         >>> dist['a'] = 1
@@ -105,12 +113,61 @@ class DiscreteDistribution(dict):
         0.0
         """
         "*** YOUR CODE HERE ***"
-        rand = random.random() * self.total()
-        index = 0
-        for key in self.keys():
-            index += self[key]
-            if index >= rand:
-                return key
+        if len(self) == 0:
+            if k is None:
+                return None
+            return [None] * k
+        return Sampler(list(self.values()), list(self.keys())).sample(k)
+
+
+class TransitionMatrix:
+    """
+    The motion model of a ghost for one arrangement of the other agents, as
+    a sparse matrix from the positions in sources to the positions in
+    targets.  distributions[i] is getPositionDistribution of sources[i], and
+    columns[j] is the (source indices, probabilities) of the moves into
+    targets[j], with the sources in increasing order.  The rows used to
+    sample moves are built the first time each source is sampled.
+    """
+
+    def __init__(self, sources, distributions):
+        self.sources = sources
+        self.distributions = distributions
+        targetIds = {}
+        self.targets = []
+        self.columns = []
+        for i, dist in enumerate(distributions):
+            for pos, prob in dist.items():
+                j = targetIds.get(pos)
+                if j is None:
+                    j = targetIds[pos] = len(self.targets)
+                    self.targets.append(pos)
+                    self.columns.append(([], []))
+                self.columns[j][0].append(i)
+                self.columns[j][1].append(prob)
+        self.rows = None
+
+    def apply(self, beliefs):
+        """
+        Given a list of the probability of each source, returns a list of the
+        probability of each target after one move.
+        """
+        return [sum(map(operator.mul, map(beliefs.__getitem__, sources), probs))
+                for sources, probs in self.columns]
+
+    def sample(self, i, k):
+        """
+        k independent draws of the position a ghost at sources[i] moves to,
+        as indices into sources, which must include every target.
+        """
+        if self.rows is None:
+            self.sourceIds = dict((pos, j) for j, pos in enumerate(self.sources))
+            self.rows = [None] * len(self.sources)
+        row = self.rows[i]
+        if row is None:
+            dist = self.distributions[i]
+            row = self.rows[i] = Sampler(list(dist.values()), [self.sourceIds[pos] for pos in dist])
+        return row.sample(k)
 
 
 class InferenceModule:
@@ -176,6 +233,26 @@ class InferenceModule:
             agent = self.ghostAgent
         return self.getPositionDistributionHelper(gameState, pos, index, agent)
 
+    def getTransitionMatrix(self, gameState):
+        """
+        Return the TransitionMatrix from self.allPositions given by
+        getPositionDistribution in gameState.  The most recently used
+        matrices are cached by the positions of Pacman and of the other
+        agents, which is all the ghost agents here look at.  Either way the
+        ghost is left in jail in gameState, as computing the distributions
+        one by one would leave it.
+        """
+        agentStates = gameState.data.agentStates
+        key = tuple(i != self.index and agentState is not None and agentState.getPosition() or None
+                    for i, agentState in enumerate(agentStates))
+        matrix = self.transitionCache.get(key)
+        if matrix is None:
+            matrix = TransitionMatrix(self.allPositions, [self.getPositionDistribution(gameState, pos)
+                                                          for pos in self.allPositions])
+            self.transitionCache.put(key, matrix)
+        self.setGhostPosition(gameState, self.allPositions[-1], self.index)
+        return matrix
+
     def getObservationProb(self, noisyDistance, pacmanPosition, ghostPosition, jailPosition):
         """
         Return the probability P(noisyDistance | pacmanPosition, ghostPosition).
@@ -191,6 +268,39 @@ class InferenceModule:
         else:
             return 0
 
+    def getTrueDistances(self, pacmanPosition):
+        """
+        Return the list of Manhattan distances from pacmanPosition to each
+        position in self.allPositions, cached by Pacman's position.
+        """
+        distances = self.distanceCache.get(pacmanPosition)
+        if distances is None:
+            distances = [manhattanDistance(pacmanPosition, pos) for pos in self.allPositions]
+            self.distanceCache[pacmanPosition] = distances
+        return distances
+
+    def getObservationLikelihoods(self, noisyDistance, pacmanPosition, jailPosition):
+        """
+        Return the list of getObservationProb of noisyDistance at each position
+        in self.allPositions, gathered from a row of the sonar's observation
+        matrix by the true distances, and cached by the observation, Pacman's
+        position and the jail.
+        """
+        key = (noisyDistance, pacmanPosition, jailPosition)
+        likelihoods = self.likelihoodCache.get(key)
+        if likelihoods is None:
+            jail = self.allPositions.index(jailPosition)
+            if noisyDistance is None:
+                likelihoods = [0] * len(self.allPositions)
+                likelihoods[jail] = 1
+            else:
+                distances = self.getTrueDistances(pacmanPosition)
+                row = busters.getObservationRow(noisyDistance, max(distances) + 1)
+                likelihoods = list(map(row.__getitem__, distances))
+                likelihoods[jail] = 0
+            self.likelihoodCache[key] = likelihoods
+        return likelihoods
+
     def setGhostPosition(self, gameState, ghostPosition, index):
         """
         Set the position of the ghost for this inference module to the specified
@@ -234,6 +344,9 @@ class InferenceModule:
         """
         self.legalPositions = [p for p in gameState.getWalls().asList(False) if p[1] > 1]
         self.allPositions = self.legalPositions + [self.getJailPosition()]
+        self.transitionCache = util.LRUCache(256)
+        self.distanceCache = {}
+        self.likelihoodCache = {}
         self.initializeUniformly(gameState)
 
     ######################################
@@ -299,11 +412,11 @@ class ExactInference(InferenceModule):
         """
         "*** YOUR CODE HERE ***"
 
-        pacman_position = gameState.getPacmanPosition()
-        jail_position = self.getJailPosition()
-        for ghost_position in self.allPositions:
-            self.beliefs[ghost_position] *= self.getObservationProb(observation, pacman_position,
-                                                                    ghost_position, jail_position)
+        likelihoods = self.getObservationLikelihoods(observation, gameState.getPacmanPosition(),
+                                                     self.getJailPosition())
+        priors = map(self.beliefs.get, self.allPositions, itertools.repeat(0))
+        beliefs = list(map(operator.mul, priors, likelihoods))
+        self.beliefs.update(zip(self.allPositions, beliefs))
         self.beliefs.normalize()
 
     def elapseTime(self, gameState):
@@ -316,11 +429,9 @@ class ExactInference(InferenceModule):
         current position is known.
         """
         "*** YOUR CODE HERE ***"
-        new_beliefs = DiscreteDistribution()
-        for oldPos in self.allPositions:
-            new_pos_dist = self.getPositionDistribution(gameState, oldPos)
-            for new_pos in new_pos_dist:
-                new_beliefs[new_pos] += self.beliefs[oldPos] * new_pos_dist[new_pos]
+        matrix = self.getTransitionMatrix(gameState)
+        beliefs = matrix.apply([self.beliefs[oldPos] for oldPos in matrix.sources])
+        new_beliefs = DiscreteDistribution(zip(matrix.targets, beliefs))
         new_beliefs.normalize()
         self.beliefs = new_beliefs
 
@@ -331,6 +442,12 @@ class ExactInference(InferenceModule):
 class ParticleFilter(InferenceModule):
     """
     A particle filter for approximately tracking a single ghost.
+
+    Each particle is the index of its position in self.allPositions, and the
+    particles are kept in an array.  The likelihood of an observation at
+    every position comes from getObservationLikelihoods, and resampling is
+    systematic, so an update is linear in the number of particles plus the
+    number of positions.
     """
 
     def __init__(self, ghostAgent, numParticles=300):
@@ -348,11 +465,10 @@ class ParticleFilter(InferenceModule):
         distributed across positions in order to ensure a uniform prior. Use
         self.particles for the list of particles.
         """
-        self.particles = []
         "*** YOUR CODE HERE ***"
-
-        for i in range(self.numParticles):
-            self.particles.append(self.legalPositions[i % len(self.legalPositions)])
+        # The legal positions are the first ones in self.allPositions
+        numLegal = len(self.legalPositions)
+        self.particles = array('i', [i % numLegal for i in range(self.numParticles)])
 
     def observeUpdate(self, observation, gameState):
         """
@@ -367,21 +483,41 @@ class ParticleFilter(InferenceModule):
         the DiscreteDistribution may be useful.
         """
         "*** YOUR CODE HERE ***"
-        belief = DiscreteDistribution()
-        pacman_position = gameState.getPacmanPosition()
-        jail_position = self.getJailPosition()
-
-        for p in self.particles:
-            prob = self.getObservationProb(observation, pacman_position, p, jail_position)
-            belief[p] += prob
-
-        if belief.total() == 0:
+        likelihoods = self.getObservationLikelihoods(observation, gameState.getPacmanPosition(),
+                                                     self.getJailPosition())
+        counts = collections.Counter(self.particles)
+        ids = sorted(counts)
+        cumulative = list(itertools.accumulate(counts[i] * likelihoods[i] for i in ids))
+        if cumulative[-1] == 0:
             self.initializeUniformly(gameState)
         else:
-            belief.normalize()
-            self.beliefs = belief
-            for i in range(self.numParticles):
-                self.particles[i] = belief.sample()
+            self.particles = self.resample(ids, cumulative)
+
+    def resample(self, ids, cumulative):
+        """
+        Systematic resampling: self.numParticles particles drawn from ids in
+        proportion to their weights, given as cumulative sums, with one
+        random offset shared by evenly spaced pointers.
+        """
+        n = self.numParticles
+        grandTotal = cumulative[-1]
+        step = grandTotal / n
+        offset = random.random() * step
+        particles = array('i')
+        drawn = 0
+        previous = 0
+        for i, total in zip(ids, cumulative):
+            if total == grandTotal and total > previous:
+                # The last id with any weight takes every pointer left, in
+                # case rounding puts the last one just past the total
+                upTo = n
+            else:
+                upTo = min(n, max(0, math.ceil((total - offset) / step)))
+            if upTo > drawn:
+                particles.extend(itertools.repeat(i, upTo - drawn))
+                drawn = upTo
+            previous = total
+        return particles
 
     def elapseTime(self, gameState):
         """
@@ -389,7 +525,11 @@ class ParticleFilter(InferenceModule):
         gameState.
         """
         "*** YOUR CODE HERE ***"
-        self.particles = [self.getPositionDistribution(gameState, particle).sample() for particle in self.particles]
+        matrix = self.getTransitionMatrix(gameState)
+        particles = array('i')
+        for i, count in collections.Counter(self.particles).items():
+            particles.extend(matrix.sample(i, count))
+        self.particles = particles
 
     def getBeliefDistribution(self):
         """
@@ -400,17 +540,20 @@ class ParticleFilter(InferenceModule):
         This function should return a normalized distribution.
         """
         "*** YOUR CODE HERE ***"
-        belief = DiscreteDistribution()
-        for particle in self.particles:
-            belief[particle] += 1
-        belief.normalize()
-        return belief
+        n = float(len(self.particles))
+        return DiscreteDistribution((self.allPositions[i], count / n)
+                                    for i, count in collections.Counter(self.particles).items())
 
 
 class JointParticleFilter(ParticleFilter):
     """
     JointParticleFilter tracks a joint distribution over tuples of all ghost
     positions.
+
+    The particles are stored by ghost: self.particles[i] is an array of the
+    position of ghost i in every particle, as an index into self.allPositions,
+    so particle k is the tuple of self.particles[i][k].  Observations are
+    weighed and moves sampled one ghost at a time over these columns.
     """
 
     def __init__(self, numParticles=600):
@@ -423,6 +566,11 @@ class JointParticleFilter(ParticleFilter):
         self.numGhosts = gameState.getNumAgents() - 1
         self.ghostAgents = []
         self.legalPositions = legalPositions
+        self.allPositions = legalPositions + [self.getJailPosition(i) for i in range(self.numGhosts)]
+        self.positionIds = dict((pos, j) for j, pos in enumerate(self.allPositions))
+        self.layoutKey = tuple(gameState.data.layout.layoutText)
+        self.distanceCache = {}
+        self.likelihoodCache = {}
         self.initializeUniformly(gameState)
 
     def initializeUniformly(self, gameState):
@@ -433,8 +581,14 @@ class JointParticleFilter(ParticleFilter):
         """
         self.particles = []
         "*** YOUR CODE HERE ***"
-        self.particles = list(itertools.product(self.legalPositions, repeat=self.numGhosts))
-        random.shuffle(self.particles)
+        # Each ghost's column holds every legal position equally often, and
+        # shuffling the columns independently pairs them uniformly at random,
+        # without enumerating the product of the positions of all the ghosts
+        numLegal = len(self.legalPositions)
+        for i in range(self.numGhosts):
+            column = [k % numLegal for k in range(self.numParticles)]
+            random.shuffle(column)
+            self.particles.append(array('i', column))
 
     def addGhostAgent(self, agent):
         """
@@ -446,6 +600,27 @@ class JointParticleFilter(ParticleFilter):
     def getJailPosition(self, i):
         return (2 * i + 1, 1)
 
+    def getMoveSampler(self, gameState, positions, i):
+        """
+        A Sampler of the index in self.allPositions that ghost i moves to from
+        positions, the positions of all the ghosts, built from
+        getPositionDistribution.  Samplers are shared through moveSamplerCache,
+        keyed by the ghost agent, the layout's text (each observation has its
+        own copy of the layout), Pacman's position and the ghost's position,
+        or all the ghosts' positions if its agent watches the other ghosts.
+        """
+        agent = self.ghostAgents[i]
+        pos = positions
+        if not getattr(agent, 'watchesOtherGhosts', True):
+            pos = positions[i]
+        key = (agent, self.layoutKey, i, pos, gameState.getPacmanPosition())
+        sampler = moveSamplerCache.get(key)
+        if sampler is None:
+            dist = self.getPositionDistribution(gameState, positions, i, agent)
+            sampler = Sampler(list(dist.values()), [self.positionIds[target] for target in dist])
+            moveSamplerCache.put(key, sampler)
+        return sampler
+
     def observe(self, gameState):
         """
         Resample the set of particles using the likelihood of the noisy
@@ -467,43 +642,44 @@ class JointParticleFilter(ParticleFilter):
         the DiscreteDistribution may be useful.
         """
         "*** YOUR CODE HERE ***"
-        belief = DiscreteDistribution()
-        new_particles = list()
-        pacman_position = gameState.getPacmanPosition()
-
-        for p in self.particles:
-            prob = 1
-            for i in range(self.numGhosts):
-                jail_pos = self.getJailPosition(i)
-                prob *= self.getObservationProb(observation[i], pacman_position, p[i], jail_pos)
-
-            belief[p] += prob
-
-        if belief.total() == 0:
+        pacmanPosition = gameState.getPacmanPosition()
+        weights = itertools.repeat(1.0, self.numParticles)
+        for i, column in enumerate(self.particles):
+            likelihoods = self.getObservationLikelihoods(observation[i], pacmanPosition, self.getJailPosition(i))
+            weights = list(map(operator.mul, weights, map(likelihoods.__getitem__, column)))
+        cumulative = list(itertools.accumulate(weights))
+        if cumulative[-1] == 0:
             self.initializeUniformly(gameState)
         else:
-            belief.normalize()
-            for i in range(self.numParticles):
-                new_particles.append(belief.sample())
-            self.particles = new_particles
+            chosen = self.resample(range(self.numParticles), cumulative)
+            self.particles = [array('i', map(column.__getitem__, chosen)) for column in self.particles]
 
     def elapseTime(self, gameState):
         """
         Sample each particle's next state based on its current state and the
         gameState.
         """
-        newParticles = []
-        for oldParticle in self.particles:
-            newParticle = list(oldParticle)  # A list of ghost positions
+        # Particles in the same positions share their move distributions,
+        # and each ghost's moves for all of them are drawn at once
+        newParticles = [array('i') for i in range(self.numGhosts)]
+        for oldParticle, count in collections.Counter(zip(*self.particles)).items():
+            oldPositions = tuple(self.allPositions[j] for j in oldParticle)
+            for i in range(self.numGhosts):
+                newParticles[i].extend(self.getMoveSampler(gameState, oldPositions, i).sample(count))
+        self.particles = newParticles
 
-            # now loop through and update each entry in newParticle...
-            "*** YOUR CODE HERE ***"
-            newParticle = [self.getPositionDistribution(gameState, oldParticle, i, self.ghostAgents[i]).sample() for i
-                           in range(self.numGhosts)]
+    def getBeliefDistribution(self):
+        n = float(self.numParticles)
+        return DiscreteDistribution((tuple(self.allPositions[j] for j in particle), count / n)
+                                    for particle, count in collections.Counter(zip(*self.particles)).items())
 
-            """*** END YOUR CODE HERE ***"""
-            newParticles.append(tuple(newParticle))
-        self.particles = newParticles
+    def getMarginalDistribution(self, i):
+        """
+        The distribution of ghost i's position alone, counted from its column.
+        """
+        n = float(self.numParticles)
+        return DiscreteDistribution((self.allPositions[j], count / n)
+                                    for j, count in collections.Counter(self.particles[i]).items())
 
 
 # One JointInference module is shared globally across instances of MarginalInference
@@ -543,8 +719,4 @@ class MarginalInference(InferenceModule):
         Return the marginal belief over a particular ghost by summing out the
         others.
         """
-        jointDistribution = jointInference.getBeliefDistribution()
-        dist = DiscreteDistribution()
-        for t, prob in jointDistribution.items():
-            dist[t[self.index - 1]] += prob
-        return dist
+        return jointInference.getMarginalDistribution(self.index - 1)
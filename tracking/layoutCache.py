@@ -0,0 +1,188 @@
+# layoutCache.py
+# --------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+An on-disk cache of data derived from a layout, so that repeated runs of
+busters.py, pacman.py or autograder.py on the same boards do not redo it.
+
+There is one file per layout, named by a hash of the layout text, so editing a
+.lay file simply makes the old entry unused.  Each file holds a small JSON
+header (the size and walls bitmap, which guard against a stale file) followed
+by the all-pairs maze distance table in native byte order, which is
+memory-mapped when read back.  Only the tracking project's distanceCalculator
+reads it.
+
+To fill or empty the cache from the command line:
+
+> python layoutCache.py --warm                # every layout in layouts/
+> python layoutCache.py --warm smallHunt,oneHunt
+> python layoutCache.py --clear
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+import mazeDistances
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.layout_cache')
+MAGIC = b'PACLAY01'
+
+# Set to False to neither read nor write cache files
+enabled = True
+
+
+def layoutKey(layoutText):
+    "The content hash that names the cache file for a layout."
+    return hashlib.sha1('\n'.join(layoutText).encode('utf-8') + MAGIC).hexdigest()
+
+def cachePath(layoutText):
+    return os.path.join(CACHE_DIR, layoutKey(layoutText) + '.bin')
+
+def gridBits(grid):
+    "Packs a Grid into an int, cell (x, y) being bit x * height + y."
+    bits, base = 0, 1
+    for x in range(grid.width):
+        for y in range(grid.height):
+            if grid[x][y]: bits |= base
+            base <<= 1
+    return bits
+
+
+class LayoutCacheEntry:
+    """
+    The cached data for one layout.  distances is a read-only memoryview over
+    the mapped file, laid out as in mazeDistances.MazeDistances.
+    """
+    def __init__(self, header, distances, mapped=None):
+        self.width = header['width']
+        self.height = header['height']
+        self.wallBits = int(header['walls'], 16)
+        self.distances = distances
+        self._mapped = mapped
+
+    def matches(self, layout):
+        "Guards against a stale or foreign file with the same name."
+        return (self.width == layout.width and self.height == layout.height and
+                self.wallBits == gridBits(layout.walls))
+
+
+def load(layout):
+    """
+    Returns the LayoutCacheEntry for a layout, or None if there is no usable
+    cache file for it, including when the file is truncated or corrupt.
+    """
+    if not enabled: return None
+    path = cachePath(layout.layoutText)
+    if not os.path.exists(path): return None
+    try:
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[:len(MAGIC)] != MAGIC: return None
+        headerLength, = struct.unpack('<I', mapped[len(MAGIC):len(MAGIC) + 4])
+        start = len(MAGIC) + 4
+        header = json.loads(mapped[start:start + headerLength].decode('utf-8'))
+        offset = start + headerLength
+        # A truncated or padded file is treated as missing rather than cast
+        if len(mapped) != offset + 2 * header['numDistances']: return None
+        distances = memoryview(mapped)[offset:].cast('H')
+    except (OSError, ValueError, KeyError, TypeError, struct.error):
+        return None
+    entry = LayoutCacheEntry(header, distances, mapped)
+    if not entry.matches(layout): return None
+    return entry
+
+def store(layout, distances):
+    """
+    Writes the cache file for a layout, given its MazeDistances.  The file is
+    written under a temporary name and renamed so readers never see half of it.
+    """
+    if not enabled: return
+    header = {'width': layout.width, 'height': layout.height, 'walls': '%x' % gridBits(layout.walls),
+              'numDistances': len(distances.distances)}
+    headerBytes = json.dumps(header).encode('utf-8')
+    # Pad so that the distance table starts on an even offset, as the 'H' cast needs
+    if (len(MAGIC) + 4 + len(headerBytes)) % 2: headerBytes += b' '
+
+    if not os.path.isdir(CACHE_DIR): os.makedirs(CACHE_DIR)
+    path = cachePath(layout.layoutText)
+    tmpPath = '%s.%d.tmp' % (path, os.getpid())
+    with open(tmpPath, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<I', len(headerBytes)))
+        f.write(headerBytes)
+        f.write(distances.distances.tobytes())
+    os.replace(tmpPath, path)
+
+def getMazeDistances(layout):
+    """
+    Returns a MazeDistances for the layout, read from the cache when possible
+    and otherwise computed and written to the cache.
+    """
+    entry = load(layout)
+    if entry is not None:
+        try:
+            return mazeDistances.MazeDistances(layout.walls, entry.distances)
+        except Exception:
+            pass  # A corrupt table is recomputed and rewritten below
+    distances = mazeDistances.MazeDistances(layout.walls)
+    try:
+        store(layout, distances)
+    except OSError:
+        pass  # A read-only checkout still works, just without the cache
+    return distances
+
+def clear():
+    "Removes every cache file.  Returns how many were removed."
+    if not os.path.isdir(CACHE_DIR): return 0
+    removed = 0
+    for name in os.listdir(CACHE_DIR):
+        if name.endswith('.bin') or name.endswith('.tmp'):
+            os.remove(os.path.join(CACHE_DIR, name))
+            removed += 1
+    return removed
+
+def warm(layoutNames):
+    "Makes sure every named layout has a cache file."
+    import layout as layoutModule
+    for name in layoutNames:
+        lay = layoutModule.getLayout(name)
+        if lay == None: raise Exception("The layout " + name + " cannot be found")
+        if load(lay) is None:
+            store(lay, mazeDistances.MazeDistances(lay.walls))
+            print('[layoutCache] cached %s' % name)
+        else:
+            print('[layoutCache] %s already cached' % name)
+
+
+if __name__ == '__main__':
+    from optparse import OptionParser
+    parser = OptionParser(__doc__)
+    parser.add_option('-w', '--warm', action='store_true', dest='warm', default=False,
+                      help='cache the layouts given as a comma separated list (default: all of layouts/)')
+    parser.add_option('-c', '--clear', action='store_true', dest='clear', default=False,
+                      help='delete every cache file')
+    options, otherjunk = parser.parse_args()
+    if options.clear:
+        print('[layoutCache] removed %d files' % clear())
+    if options.warm:
+        if otherjunk:
+            names = ','.join(otherjunk).split(',')
+        else:
+            names = sorted(n[:-4] for n in os.listdir('layouts') if n.endswith('.lay'))
+        warm(names)
+    if not options.clear and not options.warm:
+        parser.print_help()
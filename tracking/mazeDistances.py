@@ -0,0 +1,138 @@
+# mazeDistances.py
+# ----------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+This file contains a MazeDistances object which holds the length of the
+shortest path between every pair of open cells in a maze.  It is built once
+per walls grid, by a breadth first search from every open cell, and shared
+through getMazeDistances:
+
+distances = getMazeDistances(gameState.getWalls())
+distances.getDistance( (1,1), (10,10) )
+
+Cells are numbered in the order of walls.asList(False) and the distances are
+stored in a single flat array, so a lookup is two dictionary hits and one
+array index.  The same file is used by the search, multiagent and
+tracking projects.
+"""
+
+from array import array
+
+# Distance stored for pairs of cells that are not connected
+UNREACHABLE = 65535
+
+
+class MazeDistances:
+    def __init__(self, walls, distances=None):
+        """
+        Computes all pairwise maze distances for the given walls grid.  A table
+        computed earlier for the same walls (for example one read back from
+        disk) can be passed as distances to skip the searches.
+        """
+        self.width = walls.width
+        self.height = walls.height
+        self.cells = walls.asList(False)
+        self.cellIds = dict((cell, i) for i, cell in enumerate(self.cells))
+
+        numCells = len(self.cells)
+        if distances is not None:
+            if len(distances) != numCells * numCells:
+                raise Exception('Distance table does not match the walls grid')
+            self.distances = distances
+            return
+        neighbors = []
+        for x, y in self.cells:
+            adjacent = []
+            for cell in [(x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)]:
+                if cell in self.cellIds:
+                    adjacent.append(self.cellIds[cell])
+            neighbors.append(adjacent)
+
+        self.distances = array('H')
+        for source in range(numCells):
+            row = [UNREACHABLE] * numCells
+            row[source] = 0
+            frontier = [source]
+            distance = 0
+            while frontier:
+                distance += 1
+                nextFrontier = []
+                for cell in frontier:
+                    for other in neighbors[cell]:
+                        if row[other] == UNREACHABLE:
+                            row[other] = distance
+                            nextFrontier.append(other)
+                frontier = nextFrontier
+            self.distances.extend(row)
+
+    def getDistance(self, pos1, pos2):
+        """
+        Returns the maze distance between two positions.  Positions that lie
+        between two cells (as scared ghosts do) are snapped to the nearest
+        cells and the snapping distance is added.
+        """
+        cellIds = self.cellIds
+        if pos1 in cellIds and pos2 in cellIds:
+            return self.distances[cellIds[pos1] * len(self.cells) + cellIds[pos2]]
+        bestDistance = UNREACHABLE
+        for cell1, snap1 in _snap(pos1):
+            for cell2, snap2 in _snap(pos2):
+                if cell1 in cellIds and cell2 in cellIds:
+                    distance = self.distances[cellIds[cell1] * len(self.cells) + cellIds[cell2]] + snap1 + snap2
+                    if distance < bestDistance:
+                        bestDistance = distance
+        return bestDistance
+
+    def getDistancesFrom(self, pos):
+        """
+        Returns the row of distances from pos to every cell, indexed like
+        self.cells.
+        """
+        start = self.cellIds[pos] * len(self.cells)
+        return self.distances[start:start + len(self.cells)]
+
+
+def _snap(pos):
+    "The grid cells around pos, with the distance to each."
+    cells = []
+    for x, xDistance in _snap1D(pos[0]):
+        for y, yDistance in _snap1D(pos[1]):
+            cells.append(((x, y), xDistance + yDistance))
+    return cells
+
+def _snap1D(x):
+    intX = int(x)
+    if x == intX:
+        return [(intX, 0)]
+    return [(intX, x - intX), (intX + 1, intX + 1 - x)]
+
+
+# Recently used walls objects are looked up by identity first, which avoids
+# hashing the whole walls grid on every call.
+_mazeDistancesByWalls = {}
+_recentWalls = {}
+
+def getMazeDistances(walls):
+    """
+    Returns the MazeDistances for a walls grid, building it on first use.
+    """
+    recent = _recentWalls.get(id(walls))
+    if recent is not None and recent[0] is walls:
+        return recent[1]
+    if walls not in _mazeDistancesByWalls:
+        _mazeDistancesByWalls[walls.copy()] = MazeDistances(walls)
+    distances = _mazeDistancesByWalls[walls]
+    if len(_recentWalls) > 64: _recentWalls.clear()
+    _recentWalls[id(walls)] = (walls, distances)
+    return distances
@@ -29,6 +29,9 @@
 import sys
 import inspect
 import heapq, random
+import bisect
+import collections
+import itertools
 import io
 
 
@@ -222,6 +225,102 @@ class PriorityQueueWithFunction(PriorityQueue):
         "Adds an item to the queue with priority from the priority function"
         PriorityQueue.push(self, item, self.priorityFunction(item))
 
+class IndexedPriorityQueue:
+    """
+      A priority queue over distinct, hashable items that keeps a map from
+      each item to its slot in the heap.  This makes update (decrease-key)
+      and membership tests O(log n) and O(1) respectively, instead of the
+      linear scan done by PriorityQueue.update.
+
+      Ties are broken by insertion order, exactly as in PriorityQueue, so
+      replacing one with the other does not change the order of pops.
+    """
+    def  __init__(self):
+        self.heap = []
+        self.index = {}
+        self.count = 0
+
+    def push(self, item, priority):
+        "Adds 'item' with 'priority', or resets its priority if already queued"
+        if item in self.index:
+            position = self.index[item]
+            (oldPriority, c, _) = self.heap[position]
+            self.heap[position] = (priority, c, item)
+            if priority < oldPriority:
+                self._siftUp(position)
+            else:
+                self._siftDown(position)
+            return
+        self.heap.append((priority, self.count, item))
+        self.index[item] = len(self.heap) - 1
+        self.count += 1
+        self._siftUp(len(self.heap) - 1)
+
+    def pop(self):
+        "Removes and returns the item with the lowest priority"
+        last = self.heap.pop()
+        if self.heap:
+            (_, _, item) = self.heap[0]
+            self.heap[0] = last
+            self.index[last[2]] = 0
+            self._siftDown(0)
+        else:
+            item = last[2]
+        del self.index[item]
+        return item
+
+    def peek(self):
+        "Returns the item with the lowest priority without removing it"
+        return self.heap[0][2]
+
+    def isEmpty(self):
+        return len(self.heap) == 0
+
+    def update(self, item, priority):
+        # If item already in priority queue with higher priority, decrease its priority in place.
+        # If item already in priority queue with equal or lower priority, do nothing.
+        # If item not in priority queue, do the same thing as self.push.
+        position = self.index.get(item)
+        if position is None:
+            self.push(item, priority)
+        elif priority < self.heap[position][0]:
+            self.heap[position] = (priority, self.heap[position][1], item)
+            self._siftUp(position)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, item):
+        return item in self.index
+
+    def _siftUp(self, position):
+        heap, index = self.heap, self.index
+        entry = heap[position]
+        while position > 0:
+            parent = (position - 1) >> 1
+            if heap[parent] <= entry: break
+            heap[position] = heap[parent]
+            index[heap[position][2]] = position
+            position = parent
+        heap[position] = entry
+        index[entry[2]] = position
+
+    def _siftDown(self, position):
+        heap, index = self.heap, self.index
+        size = len(heap)
+        entry = heap[position]
+        child = 2 * position + 1
+        while child < size:
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if entry <= heap[child]: break
+            heap[position] = heap[child]
+            index[heap[position][2]] = position
+            position = child
+            child = 2 * position + 1
+        heap[position] = entry
+        index[entry[2]] = position
+
 
 def manhattanDistance( xy1, xy2 ):
     "Returns the Manhattan distance between points xy1 and xy2"
@@ -233,6 +332,51 @@ def manhattanDistance( xy1, xy2 ):
   The search project should not need anything below this line.
 """
 
+class LRUCache:
+    """
+      A dictionary of at most capacity entries that evicts the least
+      recently used entry when a new one would not fit, and counts the
+      hits and misses of get.
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        "Returns the value stored for key, or None if there is none."
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        if self.capacity <= 0:
+            return
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        "Removes every entry and resets the counts."
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def hitRate(self):
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / float(lookups)
+
+    def __len__(self):
+        return len(self.entries)
+
 class Counter(dict):
     """
     A counter keeps track of counts for a set of keys.
@@ -489,19 +633,40 @@ def nSample(distribution, values, n):
             cdf += distribution[distPos]
     return samples
 
+class Sampler:
+    """
+    Draws from a discrete distribution, given as for sample: a Counter, or a
+    list of weights and a list of the values they belong to.  The cumulative
+    weights are summed once, and each draw bisects them, so it takes
+    O(log n) time instead of a scan.  Each draw uses one random.random() and
+    picks the value sample would have picked with it.
+    """
+    def __init__(self, distribution, values = None):
+        if type(distribution) == Counter:
+            items = sorted(distribution.items())
+            distribution = [i[1] for i in items]
+            values = [i[0] for i in items]
+        self.values = values
+        self.cumulative = list(itertools.accumulate(distribution))
+        self.total = self.cumulative[-1]
+
+    def sample(self, k = None):
+        "One value, or a list of k values drawn independently when k is given."
+        values, cumulative, total = self.values, self.cumulative, self.total
+        if k is None:
+            return values[bisect.bisect_left(cumulative, random.random() * total)]
+        r = random.random
+        left = bisect.bisect_left
+        return [values[left(cumulative, r() * total)] for i in range(k)]
+
 def sample(distribution, values = None):
+    "One draw from distribution, as from a Sampler, without keeping its table."
     if type(distribution) == Counter:
         items = sorted(distribution.items())
         distribution = [i[1] for i in items]
         values = [i[0] for i in items]
-    if sum(distribution) != 1:
-        distribution = normalize(distribution)
-    choice = random.random()
-    i, total= 0, distribution[0]
-    while choice > total:
-        i += 1
-        total += distribution[i]
-    return values[i]
+    cumulative = list(itertools.accumulate(distribution))
+    return values[bisect.bisect_left(cumulative, random.random() * cumulative[-1])]
 
 def sampleFromCounter(ctr):
     items = sorted(ctr.items())